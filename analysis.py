@@ -0,0 +1,133 @@
+"""
+Exact expected value, variance and payout distributions for the game models.
+"""
+
+import math
+import numpy as np
+from typing import Dict
+
+from games import (
+    DiceGame,
+    WeightedProbabilitiesGame,
+    NormalDistributionGame,
+    Lucky9Game,
+    SlotMachineGame,
+    calculate_house_edge,
+)
+
+
+def _normal_pdf(z: float) -> float:
+    return math.exp(-0.5 * z * z) / math.sqrt(2 * math.pi)
+
+
+def _normal_cdf(z: float) -> float:
+    return 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+
+def clipped_normal_moments(mean: float, std: float, low: float, high: float) -> (float, float):
+    """
+    First and second moments of clip(X, low, high) for X ~ N(mean, std).
+    """
+    if std <= 0:
+        value = min(max(mean, low), high)
+        return value, value * value
+
+    alpha = (low - mean) / std
+    beta = (high - mean) / std
+    cdf_alpha, cdf_beta = _normal_cdf(alpha), _normal_cdf(beta)
+    pdf_alpha, pdf_beta = _normal_pdf(alpha), _normal_pdf(beta)
+    inside = cdf_beta - cdf_alpha
+
+    first = low * cdf_alpha + high * (1 - cdf_beta) + mean * inside + std * (pdf_alpha - pdf_beta)
+    second = (
+        low * low * cdf_alpha
+        + high * high * (1 - cdf_beta)
+        + mean * mean * inside
+        + 2 * mean * std * (pdf_alpha - pdf_beta)
+        + std * std * (inside + alpha * pdf_alpha - beta * pdf_beta)
+    )
+    return first, second
+
+
+def win_probability(game) -> float:
+    """
+    Probability that a round is recorded as `player_won`.
+    """
+    if isinstance(game, WeightedProbabilitiesGame):
+        return float(game.player_number_weight)
+    if isinstance(game, DiceGame):
+        return 1 / game.sides
+    if isinstance(game, Lucky9Game):
+        return float(np.tril(Lucky9Game.total_table(), k=-1).sum())
+    if isinstance(game, SlotMachineGame):
+        distribution = payout_distribution(game)
+        return float(sum(probability for multiplier, probability in distribution.items() if multiplier > 0))
+    raise TypeError(f"no exact model for {type(game).__name__}")
+
+
+def payout_distribution(game) -> Dict[float, float]:
+    """
+    Map each payout multiplier (payout / bet) to its probability.
+    NormalDistributionGame pays a continuous multiplier, so it has no finite table.
+    """
+    if isinstance(game, NormalDistributionGame):
+        raise ValueError("NormalDistributionGame has a continuous payout; use exact_statistics for its moments")
+
+    if isinstance(game, DiceGame):
+        win = win_probability(game)
+        return {0.0: 1 - win, float(game.payout_multiplier): win}
+
+    if isinstance(game, Lucky9Game):
+        table = Lucky9Game.total_table()
+        win = float(np.tril(table, k=-1).sum())
+        tie = float(np.trace(table))
+        distribution = {0.0: 1 - win - tie, 1.0: tie}
+        multiplier = float(game.payout_multiplier)
+        distribution[multiplier] = distribution.get(multiplier, 0.0) + win
+        return distribution
+
+    if isinstance(game, SlotMachineGame):
+        forced_share = game.force_win_chance / len(game.triple_multipliers)
+        distribution: Dict[float, float] = {}
+        for symbol, weight in zip(game.symbols, game.weights):
+            probability = (1 - game.force_win_chance) * weight ** 3
+            if symbol in game.triple_multipliers:
+                probability += forced_share
+            multiplier = float(game.triple_multipliers.get(symbol, 2.0))
+            distribution[multiplier] = distribution.get(multiplier, 0.0) + probability
+        distribution[0.0] = 1 - sum(distribution.values())
+        return distribution
+
+    raise TypeError(f"no exact model for {type(game).__name__}")
+
+
+def exact_statistics(game) -> Dict[str, float]:
+    """
+    Exact per-round expectations for a game at its configured bet amount.
+    """
+    bet = game.bet_amount
+    if isinstance(game, NormalDistributionGame):
+        win = win_probability(game)
+        low = max(game.min_multiplier, 0.0)
+        high = max(game.max_multiplier, 0.0)
+        first, second = clipped_normal_moments(game.mean_multiplier, game.std_multiplier, low, high)
+        mean_multiplier = win * first
+        second_moment = win * second
+    else:
+        distribution = payout_distribution(game)
+        multipliers = np.array(list(distribution.keys()))
+        probabilities = np.array(list(distribution.values()))
+        mean_multiplier = float((multipliers * probabilities).sum())
+        second_moment = float((multipliers ** 2 * probabilities).sum())
+
+    expected_payout = bet * mean_multiplier
+    variance = bet * bet * (second_moment - mean_multiplier ** 2)
+    return {
+        "win_probability": win_probability(game),
+        "expected_payout": expected_payout,
+        "expected_player_profit": expected_payout - bet,
+        "expected_house_profit": bet - expected_payout,
+        "variance": variance,
+        "std": math.sqrt(max(variance, 0.0)),
+        "house_edge": calculate_house_edge(1.0, mean_multiplier),
+    }
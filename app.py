@@ -1,14 +1,141 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify
+import json
+import math
+import time
 from pathlib import Path
-import numpy as np
 
 # Running as a module-less script, so use absolute imports within the folder
-from simulation import run_games, calculate_statistics
-from games import calculate_house_edge, Lucky9Game, SlotMachineGame
-
-
-def create_app():
+from simulation import (
+    GAME_LABELS,
+    build_game,
+    build_games,
+    run_games,
+    run_games_adaptive,
+    run_games_bankroll,
+    run_games_streaming,
+    calculate_statistics,
+    calculate_statistics_chunked,
+    iter_simulation_chunks,
+)
+from games import COLORS, new_seed, prewarm_models, shared_game, with_seed, Lucky9Game
+from analysis import exact_statistics
+from variance import METHODS, control_variate_from_rounds, estimate_house_edge
+from cache import ResultCache
+from charts import downsample_cumulative
+from sessions import HandStore
+from bulk import iter_ndjson, iter_npy, run_bulk
+from sweep import SWEEP_PARAMETERS, parse_values, run_sweep
+from jobs import JobQueue, QueueFull
+from metrics import METRICS, RequestProfiler
+from runs import RunStore
+from export import MIMETYPES, iter_export
+from tables import InsufficientFunds, TableEngine, TableLimit
+
+
+def create_app(config: dict = None):
     app = Flask(__name__, template_folder=str(Path(__file__).parent / "templates"))
+    # Process-pool size for /simulate; 1 keeps everything in the request thread.
+    app.config.setdefault("SIMULATION_WORKERS", 1)
+    # Seeded /simulate runs are cached; set RESULT_CACHE_DIR to also keep them on disk.
+    app.config.setdefault("RESULT_CACHE_SIZE", 16)
+    app.config.setdefault("RESULT_CACHE_TTL", 3600.0)
+    app.config.setdefault("RESULT_CACHE_DIR", None)
+    # Bytes of round data the cache may hold; runs above RESULT_CACHE_ENTRY_BYTES are never cached.
+    app.config.setdefault("RESULT_CACHE_BYTES", 256 * 2**20)
+    app.config.setdefault("RESULT_CACHE_ENTRY_BYTES", 64 * 2**20)
+    # Point budget per cumulative-profit series on the results chart ("minmax" or "lttb").
+    app.config.setdefault("CHART_MAX_POINTS", 2000)
+    app.config.setdefault("CHART_DOWNSAMPLE", "minmax")
+    # Largest chart_points a request may ask for.
+    app.config.setdefault("CHART_POINTS_LIMIT", 100_000)
+    # Largest `count` accepted by /api/bulk in one request.
+    app.config.setdefault("BULK_MAX_ROUNDS", 1_000_000)
+    # Open interactive Lucky 9 hands live in-process; idle ones expire and the oldest are dropped past the cap.
+    app.config.setdefault("LUCKY9_MAX_HANDS", 10000)
+    app.config.setdefault("LUCKY9_HAND_TTL", 900.0)
+    # Largest grid and per-point round count accepted by /sweep and /api/sweep.
+    app.config.setdefault("SWEEP_MAX_POINTS", 400)
+    app.config.setdefault("SWEEP_MAX_ROUNDS", 1_000_000)
+    # Background /simulate jobs: worker threads, how many may be queued or running, and how long results are kept.
+    app.config.setdefault("SIMULATION_JOB_WORKERS", 2)
+    app.config.setdefault("SIMULATION_JOB_QUEUE_DEPTH", 8)
+    app.config.setdefault("SIMULATION_JOB_TTL", 3600.0)
+    app.config.setdefault("SIMULATION_JOB_RETRY_AFTER", 5)
+    # Stage timers and counters served at /metrics; off by default.
+    app.config.setdefault("METRICS_ENABLED", False)
+    # Per-request cProfile via the X-Profile header or ?profile=1; the report replaces the response body.
+    app.config.setdefault("PROFILE_ENABLED", False)
+    app.config.setdefault("PROFILE_LIMIT", 40)
+    # Directory for saved full-mode runs (memory-mapped .npy columns); None disables saving.
+    app.config.setdefault("RUN_STORE_DIR", None)
+    # Build game tables and compile templates in create_app, so a preloading server's workers inherit them.
+    app.config.setdefault("PREWARM_MODELS", True)
+    # Interactive game tables: how many may be open, idle expiry, and the most bets settled by one draw.
+    app.config.setdefault("TABLE_MAX", 1000)
+    app.config.setdefault("TABLE_TTL", 3600.0)
+    app.config.setdefault("TABLE_MAX_BATCH", 4096)
+    app.config.update(config or {})
+
+    result_cache = ResultCache(
+        max_entries=app.config["RESULT_CACHE_SIZE"],
+        ttl=app.config["RESULT_CACHE_TTL"],
+        directory=app.config["RESULT_CACHE_DIR"],
+        max_bytes=app.config["RESULT_CACHE_BYTES"],
+        max_entry_bytes=app.config["RESULT_CACHE_ENTRY_BYTES"],
+    )
+    app.extensions["result_cache"] = result_cache
+    hand_store = HandStore(max_hands=app.config["LUCKY9_MAX_HANDS"], ttl=app.config["LUCKY9_HAND_TTL"])
+    app.extensions["lucky9_hands"] = hand_store
+    job_queue = JobQueue(
+        workers=app.config["SIMULATION_JOB_WORKERS"],
+        max_pending=app.config["SIMULATION_JOB_QUEUE_DEPTH"],
+        ttl=app.config["SIMULATION_JOB_TTL"],
+    )
+    app.extensions["simulation_jobs"] = job_queue
+    run_store = RunStore(app.config["RUN_STORE_DIR"]) if app.config["RUN_STORE_DIR"] else None
+    app.extensions["run_store"] = run_store
+    table_engine = TableEngine(
+        max_tables=app.config["TABLE_MAX"], ttl=app.config["TABLE_TTL"], max_batch=app.config["TABLE_MAX_BATCH"]
+    )
+    app.extensions["game_tables"] = table_engine
+    if app.config["PREWARM_MODELS"]:
+        prewarm_models()
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+    if app.config["METRICS_ENABLED"]:
+        METRICS.enabled = True
+    profiler = RequestProfiler(limit=app.config["PROFILE_LIMIT"])
+
+    @app.before_request
+    def start_instrumentation():
+        if METRICS.enabled:
+            g.request_started = time.perf_counter()
+        wanted = request.headers.get("X-Profile") or request.args.get("profile")
+        if app.config["PROFILE_ENABLED"] and wanted not in (None, "", "0"):
+            g.profile = profiler.start()
+
+    @app.after_request
+    def finish_instrumentation(response):
+        if getattr(g, "profile", None) is not None:
+            report = profiler.stop(g.profile)
+            g.profile = None
+            # Streamed bodies are produced after this point, so only the view itself is profiled.
+            response = Response(report, status=response.status_code, mimetype="text/plain")
+            response.headers["X-Profile"] = "captured"
+        if "request_started" in g:
+            endpoint = request.endpoint or "unmatched"
+            METRICS.observe("http_request_seconds", time.perf_counter() - g.request_started, endpoint=endpoint)
+            METRICS.count(
+                "http_requests_total", endpoint=endpoint, method=request.method, status=response.status_code
+            )
+        return response
+
+    @app.teardown_request
+    def release_profiler(exc):
+        # after_request is skipped when the view raises; stop the capture here so the profiler is not left busy.
+        if getattr(g, "profile", None) is not None:
+            profiler.stop(g.profile)
+            g.profile = None
 
     GAME_CHOICES = [
         ("fair", "Fair Game"),
@@ -36,6 +163,34 @@ def create_app():
     def run_simulation_page():
         return render_template("simulate.html", game_choices=GAME_CHOICES)
 
+    def lucky9_response(result: dict, bet_amount: float, payout_multiplier: float, seed):
+        # Shared games play a unit bet; scale the payout to this request's bet.
+        payout = bet_amount * result["payout"]
+        return jsonify(
+            {
+                "player_cards": result["player_cards"],
+                "dealer_cards": result["dealer_cards"],
+                "player_total": result["player_total"],
+                "dealer_total": result["dealer_total"],
+                "player_won": result["player_won"],
+                "tie": result["tie"],
+                "payout": round(payout, 2),
+                "player_profit": round(payout - bet_amount, 2),
+                "house_profit": round(bet_amount - payout, 2),
+                "payout_multiplier": payout_multiplier,
+                "bet_amount": bet_amount,
+                "seed": seed,
+            }
+        )
+
+    def request_game(data: dict, *key):
+        # Unseeded calls draw from the shared game's running stream; a seed gets its own replayable copy.
+        game = shared_game(*key)
+        if data.get("seed") is None:
+            return game, None
+        game = with_seed(game, data["seed"])
+        return game, game.seed
+
     @app.route("/api/roll", methods=["POST"])
     def api_roll():
         data = request.get_json() or {}
@@ -44,42 +199,28 @@ def create_app():
         mode = (data.get("mode") or "fair").lower()
         chosen_prob = float(data.get("chosen_prob") or 0.18)
 
-        colors = ["red", "blue", "green", "yellow", "pink", "white"]
-        if bet_color not in colors:
+        if bet_color not in COLORS:
             return jsonify({"error": "invalid bet color"}), 400
 
-        if mode == "tweaked":
-            chosen_p = max(0.05, min(chosen_prob, 0.3))
-            remaining = (1.0 - chosen_p) / (len(colors) - 1)
-            probs = [remaining] * len(colors)
-            probs[colors.index(bet_color)] = chosen_p
-            multipliers = {0: 0.0, 1: 0.9, 2: 1.8, 3: 2.7}
-        elif mode == "weighted":
-            chosen_p = max(0.05, min(chosen_prob, 0.3))
-            remaining = (1.0 - chosen_p) / (len(colors) - 1)
-            probs = [remaining] * len(colors)
-            probs[colors.index(bet_color)] = chosen_p
-            multipliers = {0: 0.0, 1: 1.0, 2: 2.0, 3: 3.0}
+        # Normalize the registry key: the chosen probability is clamped and unused in fair mode.
+        if mode in ("tweaked", "weighted"):
+            game, seed = request_game(data, mode, bet_color, max(0.05, min(chosen_prob, 0.3)))
         else:
-            probs = [1 / len(colors)] * len(colors)
-            multipliers = {0: 0.0, 1: 1.0, 2: 2.0, 3: 3.0}
-
-        dice = np.random.choice(colors, size=3, p=probs)
-        matches = int(sum(c == bet_color for c in dice))
-        payout = bet_amount * multipliers.get(matches, 0.0)
-        player_profit = payout - bet_amount
-        house_profit = bet_amount - payout
+            game, seed = request_game(data, "fair", bet_color)
+        result = game.play()
+        payout = bet_amount * result["multiplier"]
 
         return jsonify(
             {
-                "dice": dice.tolist(),
-                "matches": matches,
+                "dice": result["dice"],
+                "matches": result["matches"],
                 "payout": round(payout, 2),
-                "player_profit": round(player_profit, 2),
-                "house_profit": round(house_profit, 2),
+                "player_profit": round(payout - bet_amount, 2),
+                "house_profit": round(bet_amount - payout, 2),
                 "mode": mode,
                 "bet_color": bet_color,
-                "probabilities": probs,
+                "probabilities": game.probabilities,
+                "seed": seed,
             }
         )
 
@@ -89,24 +230,9 @@ def create_app():
         bet_amount = float(data.get("bet_amount") or 10.0)
         payout_multiplier = float(data.get("payout_multiplier") or 2.0)
 
-        game = Lucky9Game(bet_amount=bet_amount, payout_multiplier=payout_multiplier)
+        game, seed = request_game(data, "lucky9", None, None, payout_multiplier)
         result = game.play()
-
-        return jsonify(
-            {
-                "player_cards": result["player_cards"],
-                "dealer_cards": result["dealer_cards"],
-                "player_total": result["player_total"],
-                "dealer_total": result["dealer_total"],
-                "player_won": result["player_won"],
-                "tie": result["tie"],
-                "payout": round(result["payout"], 2),
-                "player_profit": round(result["player_profit"], 2),
-                "house_profit": round(result["house_profit"], 2),
-                "payout_multiplier": payout_multiplier,
-                "bet_amount": bet_amount,
-            }
-        )
+        return lucky9_response(result, bet_amount, payout_multiplier, seed)
 
     @app.route("/api/lucky9/peek", methods=["POST"])
     def api_lucky9_peek():
@@ -114,34 +240,33 @@ def create_app():
         bet_amount = float(data.get("bet_amount") or 10.0)
         payout_multiplier = float(data.get("payout_multiplier") or 2.0)
 
-        game = Lucky9Game(bet_amount=bet_amount, payout_multiplier=payout_multiplier)
-        deck = game.build_deck()
-        player_cards, deck = game.draw_from_deck(deck, 2)
+        game, seed = request_game(data, "lucky9", None, None, payout_multiplier)
+        hand_id, hand = hand_store.open(game, bet_amount, payout_multiplier)
 
         return jsonify(
             {
-                "player_cards": player_cards.tolist(),
-                "player_total": int(game.hand_total(player_cards)),
-                "deck": deck.tolist(),
+                "hand_id": hand_id,
+                "player_cards": hand.player_cards.tolist(),
+                "player_total": Lucky9Game.hand_total(hand.player_cards),
+                "seed": seed,
             }
         )
 
     @app.route("/api/lucky9/draw", methods=["POST"])
     def api_lucky9_draw():
         data = request.get_json() or {}
-        deck = np.array(data.get("deck") or [], dtype=float)
-        player_cards = np.array(data.get("player_cards") or [], dtype=float)
-
-        if len(deck) == 0:
-            return jsonify({"error": "deck empty"}), 400
+        try:
+            hand, drawn = hand_store.draw(str(data.get("hand_id") or ""))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        if hand is None:
+            return jsonify({"error": "unknown or expired hand"}), 404
 
-        drawn, deck = Lucky9Game.draw_from_deck(deck, 1)
-        player_cards = np.concatenate([player_cards, drawn])
         return jsonify(
             {
-                "player_cards": player_cards.tolist(),
-                "player_total": int(Lucky9Game.hand_total(player_cards)),
-                "deck": deck.tolist(),
+                "hand_id": data["hand_id"],
+                "player_cards": hand.player_cards.tolist(),
+                "player_total": Lucky9Game.hand_total(hand.player_cards),
                 "drawn": drawn.tolist(),
             }
         )
@@ -149,37 +274,27 @@ def create_app():
     @app.route("/api/lucky9/resolve", methods=["POST"])
     def api_lucky9_resolve():
         data = request.get_json() or {}
-        bet_amount = float(data.get("bet_amount") or 10.0)
-        payout_multiplier = float(data.get("payout_multiplier") or 2.0)
-        player_cards = np.array(data.get("player_cards") or [], dtype=float)
-        dealer_cards = np.array(data.get("dealer_cards") or [], dtype=float)
-        deck = np.array(data.get("deck") or [], dtype=float)
-
-        if len(player_cards) < 2:
-            return jsonify({"error": "need at least two player cards"}), 400
-
-        # If dealer cards not provided, draw two fresh from remaining deck
-        if len(dealer_cards) < 2:
-            drawn, remaining = Lucky9Game.draw_from_deck(deck, 2)
-            dealer_cards = drawn
-            deck = remaining
+        hand = hand_store.close(str(data.get("hand_id") or ""))
+        if hand is None:
+            return jsonify({"error": "unknown or expired hand"}), 404
 
-        game = Lucky9Game(bet_amount=bet_amount, payout_multiplier=payout_multiplier)
-        result = game.resolve(player_cards, dealer_cards)
+        game = shared_game("lucky9", None, None, hand.payout_multiplier)
+        result = game.resolve(hand.player_cards, hand.dealer_cards)
+        return lucky9_response(result, hand.bet_amount, hand.payout_multiplier, None)
 
+    @app.route("/api/lucky9/fold", methods=["POST"])
+    def api_lucky9_fold():
+        data = request.get_json() or {}
+        hand = hand_store.close(str(data.get("hand_id") or ""))
+        if hand is None:
+            return jsonify({"error": "unknown or expired hand"}), 404
+        # The bet is forfeit; the dealer's cards are never revealed.
         return jsonify(
             {
-                "player_cards": result["player_cards"],
-                "dealer_cards": result["dealer_cards"],
-                "player_total": result["player_total"],
-                "dealer_total": result["dealer_total"],
-                "player_won": result["player_won"],
-                "tie": result["tie"],
-                "payout": round(result["payout"], 2),
-                "player_profit": round(result["player_profit"], 2),
-                "house_profit": round(result["house_profit"], 2),
-                "payout_multiplier": payout_multiplier,
-                "bet_amount": bet_amount,
+                "hand_id": data["hand_id"],
+                "payout": 0.0,
+                "player_profit": -hand.bet_amount,
+                "house_profit": hand.bet_amount,
             }
         )
 
@@ -187,70 +302,252 @@ def create_app():
     def api_slot_spin():
         data = request.get_json() or {}
         bet_amount = float(data.get("bet_amount") or 1.0)
-        game = SlotMachineGame(bet_amount=bet_amount)
+        game, seed = request_game(data, "slot")
         result = game.play()
+        payout = bet_amount * result["multiplier"]
         return jsonify(
             {
                 "spin": result["spin_result"],
                 "multiplier": result["multiplier"],
-                "payout": round(result["payout"], 2),
-                "player_profit": round(result["player_profit"], 2),
-                "house_profit": round(result["house_profit"], 2),
+                "payout": round(payout, 2),
+                "player_profit": round(payout - bet_amount, 2),
+                "house_profit": round(bet_amount - payout, 2),
+                "seed": seed,
             }
         )
 
-    @app.route("/simulate", methods=["POST"])
-    def simulate():
-        form = request.form
+    @app.route("/api/bulk", methods=["POST"])
+    def api_bulk():
+        data = request.get_json() or {}
+        game = (data.get("game") or "").lower()
+        count = int(data.get("count") or 1000)
+        bet_amount = float(data.get("bet_amount") or 1.0)
+        output = (data.get("format") or "ndjson").lower()
+
+        if not 1 <= count <= app.config["BULK_MAX_ROUNDS"]:
+            return jsonify({"error": f"count must be between 1 and {app.config['BULK_MAX_ROUNDS']}"}), 400
+        if output not in ("ndjson", "binary"):
+            return jsonify({"error": "format must be ndjson or binary"}), 400
+        try:
+            records, summary = run_bulk(game, data.get("params") or {}, count, bet_amount, data.get("seed"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        if output == "binary":
+            # The batch is drawn before streaming starts, so the summary can travel as a header.
+            return Response(
+                iter_npy(records),
+                mimetype="application/octet-stream",
+                headers={"X-Bulk-Summary": json.dumps(summary)},
+            )
+        return Response(iter_ndjson(game, records, summary), mimetype="application/x-ndjson")
+
+    @app.route("/api/tables", methods=["POST"])
+    def api_table_open():
+        data = request.get_json() or {}
+        params = {key: data[key] for key in ("bet_color", "mode", "chosen_prob", "payout_multiplier") if key in data}
+        try:
+            table = table_engine.open((data.get("game") or "").lower(), params, data.get("seed"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except TableLimit as exc:
+            return jsonify({"error": str(exc)}), 503
+        response = jsonify(table.as_dict())
+        response.headers["Location"] = f"/api/tables/{table.id}"
+        return response, 201
+
+    @app.route("/api/tables", methods=["GET"])
+    def api_tables():
+        return jsonify({"tables": [table.as_dict() for table in table_engine.tables()]})
+
+    @app.route("/api/tables/<table_id>", methods=["GET"])
+    def api_table(table_id):
+        table = table_engine.get(table_id)
+        if table is None:
+            return jsonify({"error": "unknown or expired table"}), 404
+        return jsonify(table.as_dict(balances=True))
+
+    @app.route("/api/tables/<table_id>", methods=["DELETE"])
+    def api_table_close(table_id):
+        table = table_engine.close(table_id)
+        if table is None:
+            return jsonify({"error": "unknown or expired table"}), 404
+        return jsonify(table.as_dict(balances=True))
+
+    @app.route("/api/tables/<table_id>/<action>", methods=["POST"])
+    def api_table_action(table_id, action):
+        table = table_engine.get(table_id)
+        if table is None:
+            return jsonify({"error": "unknown or expired table"}), 404
+        data = request.get_json() or {}
+        player = str(data.get("player") or "")
+        try:
+            if action == "join":
+                return jsonify({"player": player, "balance": table.join(player, float(data.get("buy_in") or 100.0))})
+            if action == "leave":
+                return jsonify({"player": player, "cash_out": round(table.leave(player), 2)})
+            if action == "bet":
+                return jsonify({"player": player, **table.bet(player, float(data.get("bet_amount") or 1.0))})
+        except KeyError:
+            return jsonify({"error": f"player {player!r} has not joined this table"}), 404
+        except (ValueError, InsufficientFunds) as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify({"error": f"unknown action {action!r}; expected join, leave or bet"}), 404
+
+    def chart_points(value) -> int:
+        # Clamped here rather than trusting the form's max; 0 still means no chart.
+        points = int(value or app.config["CHART_MAX_POINTS"])
+        return min(max(points, 0), app.config["CHART_POINTS_LIMIT"])
+
+    def simulation_request(form) -> dict:
         selected = form.getlist("games")
-        num_simulations = int(float(form.get("num_simulations", 5000)))
-        bet_amount = float(form.get("bet_amount", 1.0))
-
-        params = {
-            "fair": "fair" in selected,
-            "tweaked": "tweaked" in selected,
-            "weighted": "weighted" in selected,
-            "modified_payout": "modified_payout" in selected,
-            "normal_dist": "normal_dist" in selected,
-            "lucky9": "lucky9" in selected,
-            "slot_machine": "slot_machine" in selected,
-            "tweaked_payout": float(form.get("tweaked_payout", 5.0)),
-            "weighted_prob": float(form.get("weighted_prob", 0.12)),
-            "modified_payout": float(form.get("modified_payout", 5.7)),
-            "normal_mean": float(form.get("normal_mean", 5.0)),
-            "normal_std": float(form.get("normal_std", 1.5)),
-            "lucky9_payout": float(form.get("lucky9_payout", 2.0)),
+        seed = int(form["seed"]) if form.get("seed") else None
+        return {
+            "num_simulations": int(float(form.get("num_simulations", 5000))),
+            "bet_amount": float(form.get("bet_amount", 1.0)),
+            "mode": form.get("mode", "full"),
+            "streaming": form.get("mode", "full") == "streaming",
+            # House ROI +/- this many percentage points; when set, num_simulations is only a cap.
+            "target_precision": float(form["target_precision"]) if form.get("target_precision") else None,
+            "confidence": float(form.get("confidence") or 0.95),
+            # Only runs with a caller-chosen seed are repeatable, so only those are cached.
+            "cacheable": seed is not None,
+            "seed": new_seed() if seed is None else seed,
+            # 0 skips the chart, so the cumulative series is never built.
+            "chart_points": chart_points(form.get("chart_points")),
+            # Full-mode runs can be kept in the run store and reopened later at /runs/<run_id>.
+            "save_run": bool(form.get("save_run")),
+            # Opt-in control-variate edge estimate from the full-mode rounds.
+            "control_variate": bool(form.get("control_variate")),
+            "params": {
+                "fair": "fair" in selected,
+                "tweaked": "tweaked" in selected,
+                "weighted": "weighted" in selected,
+                "modified_payout": "modified_payout" in selected,
+                "normal_dist": "normal_dist" in selected,
+                "lucky9": "lucky9" in selected,
+                "slot_machine": "slot_machine" in selected,
+                "tweaked_payout": float(form.get("tweaked_payout", 5.0)),
+                "weighted_prob": float(form.get("weighted_prob", 0.12)),
+                "modified_payout": float(form.get("modified_payout", 5.7)),
+                "normal_mean": float(form.get("normal_mean", 5.0)),
+                "normal_std": float(form.get("normal_std", 1.5)),
+                "lucky9_payout": float(form.get("lucky9_payout", 2.0)),
+            },
+            # Only used in bankroll mode, where num_simulations is the per-player round cap.
+            "bankroll": {
+                "num_players": int(form.get("num_players") or 10000),
+                "starting_bankroll": float(form.get("starting_bankroll") or 100.0),
+                "stop_loss": float(form["stop_loss"]) if form.get("stop_loss") else None,
+                "stop_win": float(form["stop_win"]) if form.get("stop_win") else None,
+                "strategy": form.get("strategy") or "flat",
+                "bet_fraction": float(form.get("bet_fraction") or 0.02),
+            },
         }
 
-        results = run_games(num_simulations, bet_amount, params)
+    def run_simulation_request(spec: dict, progress=None) -> dict:
+        """
+        Run (or fetch from cache) one /simulate request and return the results.html context.
+        """
+        num_simulations, bet_amount = spec["num_simulations"], spec["bet_amount"]
+        params, seed, streaming = spec["params"], spec["seed"], spec["streaming"]
+        workers = app.config["SIMULATION_WORKERS"]
+        if spec["mode"] == "bankroll":
+            return run_bankroll_request(spec, progress)
+
+        cache_key = None
+        if spec["cacheable"]:
+            cache_key = result_cache.make_key(
+                params,
+                num_simulations,
+                bet_amount,
+                seed,
+                streaming=streaming,
+                workers=workers,
+                target_precision=spec["target_precision"],
+                confidence=spec["confidence"],
+            )
+        with METRICS.stage("cache_lookup"):
+            cached = result_cache.get(cache_key) if cache_key else None
+
+        if cached is not None:
+            results, all_stats = cached
+        # Precision-targeted runs keep running statistics only, like streaming mode.
+        elif spec["target_precision"]:
+            all_stats = run_games_adaptive(
+                spec["target_precision"],
+                bet_amount,
+                params,
+                confidence=spec["confidence"],
+                max_rounds=num_simulations,
+                seed=seed,
+                progress=progress,
+            )
+            results = {}
+        # Streaming mode keeps only running statistics, so there is no per-round chart series.
+        elif streaming:
+            all_stats = run_games_streaming(
+                num_simulations, bet_amount, params, workers=workers, seed=seed, progress=progress
+            )
+            results = {}
+        else:
+            results = run_games(num_simulations, bet_amount, params, workers=workers, seed=seed, progress=progress)
+            all_stats = {label: calculate_statistics(result) for label, result in results.items()}
+        if cache_key and cached is None:
+            result_cache.set(cache_key, (results, all_stats))
+        context = results_context(spec, results, all_stats)
+        if spec["save_run"] and run_store is not None and results:
+            with METRICS.stage("save_run"):
+                context["run_id"] = run_store.save(results, num_simulations, bet_amount, seed, params)
+        return context
+
+    def results_context(spec: dict, results: dict, all_stats: dict, stored: bool = False) -> dict:
+        """
+        results.html context for one run. Stored runs are memory-mapped, so their
+        rows skip the control-variate estimate, which needs every round in memory.
+        """
+        games = build_games(spec["bet_amount"], spec["params"])
         stats_rows = []
         chart_series = []
         metrics_series = []
-        for label, df in results.items():
-            stats = calculate_statistics(df)
-            theoretical_edge = ""
-            if label == "Reduced Payout":
-                theoretical_edge = f"{calculate_house_edge(1/6, params['tweaked_payout']):.2f}%"
-            chart_series.append(
-                {
-                    "label": label,
-                    "data": [
-                        {"x": int(row.game_number), "y": float(row.cumulative_player_profit)}
-                        for row in df[["game_number", "cumulative_player_profit"]].itertuples()
-                    ],
-                }
-            )
+        for label, stats in all_stats.items():
+            theoretical_edge = f"{exact_statistics(games[label])['house_edge']:.2f}%"
+            row = {}
+            if label in results and spec["chart_points"] > 0:
+                result = results[label]
+                with METRICS.stage("chart_series"):
+                    xs, ys = downsample_cumulative(
+                        result.player_profit, spec["chart_points"], app.config["CHART_DOWNSAMPLE"]
+                    )
+                    chart_series.append(
+                        {"label": label, "data": [{"x": x, "y": y} for x, y in zip(xs.tolist(), ys.tolist())]}
+                    )
+            if label in results and not stored and spec.get("control_variate") and len(results[label]) >= 2:
+                # The stored rounds also give a control-variate edge estimate at no extra simulation cost.
+                result = results[label]
+                with METRICS.stage("control_variate"):
+                    estimate = control_variate_from_rounds(games[label], result.payout, result.player_won)
+                row["cv_edge"] = f"{estimate['house_edge']:.2f}% ± {1.96 * estimate['std_error']:.2f}"
+                row["effective_sample_size"] = format_sample_size(estimate["effective_sample_size"])
             stats_rows.append(
                 {
+                    **row,
                     "game": label,
                     "win_rate": f"{stats['win_rate']*100:.2f}%",
                     "player_roi": f"{stats['player_roi']:.2f}%",
                     "house_roi": f"{stats['house_roi']:.2f}%",
                     "final_player_balance": f"{stats['final_player_balance']:.2f}",
                     "final_house_balance": f"{stats['final_house_balance']:.2f}",
-                    "theoretical_edge": theoretical_edge or "N/A",
+                    "max_player_drawdown": f"{stats['max_player_drawdown']:.2f}",
+                    "theoretical_edge": theoretical_edge,
                 }
             )
+            if "rounds_used" in stats:
+                stats_rows[-1]["rounds_used"] = stats["rounds_used"]
+                stats_rows[-1]["house_roi_ci"] = (
+                    f"{stats['house_roi_ci_low']:.2f}% to {stats['house_roi_ci_high']:.2f}%"
+                    + ("" if stats["converged"] else " (cap reached)")
+                )
             metrics_series.append(
                 {
                     "label": label,
@@ -260,15 +557,314 @@ def create_app():
                 }
             )
 
-        return render_template(
-            "results.html",
-            stats_rows=stats_rows,
-            num_simulations=num_simulations,
-            bet_amount=bet_amount,
-            chart_series=chart_series,
-            metrics_series=metrics_series,
+        return {
+            "mode": spec["mode"],
+            "target_precision": spec["target_precision"],
+            "confidence": spec["confidence"],
+            "stats_rows": stats_rows,
+            "num_simulations": spec["num_simulations"],
+            "bet_amount": spec["bet_amount"],
+            "streaming": spec["streaming"],
+            "seed": spec["seed"],
+            "chart_series": chart_series,
+            "metrics_series": metrics_series,
+        }
+
+    def format_sample_size(size: float) -> str:
+        return "exact" if math.isinf(size) else f"{size:,.0f}"
+
+    def run_bankroll_request(spec: dict, progress=None) -> dict:
+        cache_key = None
+        if spec["cacheable"]:
+            cache_key = result_cache.make_key(
+                spec["params"], spec["num_simulations"], spec["bet_amount"], spec["seed"], bankroll=spec["bankroll"]
+            )
+        results = result_cache.get(cache_key) if cache_key else None
+        if results is None:
+            results = run_games_bankroll(
+                spec["num_simulations"],
+                spec["bet_amount"],
+                spec["params"],
+                seed=spec["seed"],
+                progress=progress,
+                **spec["bankroll"],
+            )
+            if cache_key:
+                result_cache.set(cache_key, results)
+
+        bankroll_rows = []
+        survival_series = []
+        for label, result in results.items():
+            summary = result.summary()
+            ruined = summary["ruin_probability"] > 0
+            bankroll_rows.append(
+                {
+                    "game": label,
+                    "ruin_probability": f"{summary['ruin_probability']*100:.2f}%",
+                    "stop_loss_probability": f"{summary['stop_loss_probability']*100:.2f}%",
+                    "stop_win_probability": f"{summary['stop_win_probability']*100:.2f}%",
+                    "survival_probability": f"{summary['survival_probability']*100:.2f}%",
+                    "median_time_to_ruin": f"{summary['median_time_to_ruin']:.0f}" if ruined else "-",
+                    "p90_time_to_ruin": f"{summary['p90_time_to_ruin']:.0f}" if ruined else "-",
+                    "mean_final_bankroll": f"{summary['mean_final_bankroll']:.2f}",
+                }
+            )
+            rounds, surviving = result.survival_curve()
+            survival_series.append(
+                {
+                    "label": label,
+                    "data": [{"x": x, "y": round(y * 100, 3)} for x, y in zip(rounds.tolist(), surviving.tolist())],
+                }
+            )
+
+        return {
+            "mode": "bankroll",
+            "bankroll": spec["bankroll"],
+            "bankroll_rows": bankroll_rows,
+            "survival_series": survival_series,
+            "num_simulations": spec["num_simulations"],
+            "bet_amount": spec["bet_amount"],
+            "streaming": False,
+            "seed": spec["seed"],
+            "stats_rows": [],
+            "chart_series": [],
+            "metrics_series": [],
+        }
+
+    @app.route("/simulate", methods=["POST"])
+    def simulate():
+        context = run_simulation_request(simulation_request(request.form))
+        with METRICS.stage("render"):
+            return render_template("results.html", **context)
+
+    def export_response(chunked: dict, name: str, headers: dict):
+        output = (request.values.get("format") or "csv").lower()
+        level = (request.values.get("level") or "rounds").lower()
+        try:
+            body = iter_export(chunked, output, level)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except RuntimeError as exc:
+            return jsonify({"error": str(exc)}), 501
+        extension = "arrows" if output == "arrow" else output
+        headers["Content-Disposition"] = f'attachment; filename="{name}-{level}.{extension}"'
+        return Response(body, mimetype=MIMETYPES[output], headers=headers)
+
+    @app.route("/simulate/export", methods=["POST"])
+    def simulate_export():
+        """
+        Stream the rounds /simulate (full mode, one worker) would play for the
+        same form, without keeping them: each chunk is simulated, written out and dropped.
+        """
+        spec = simulation_request(request.form)
+        games = build_games(spec["bet_amount"], spec["params"], spec["seed"])
+        chunked = {
+            label: iter_simulation_chunks(game, spec["num_simulations"], label=label) for label, game in games.items()
+        }
+        return export_response(chunked, f"simulation-{spec['seed']}", {"X-Simulation-Seed": str(spec["seed"])})
+
+    @app.route("/simulate/jobs", methods=["POST"])
+    def simulate_job_submit():
+        spec = simulation_request(request.form)
+        labels = list(build_games(spec["bet_amount"], spec["params"]))
+        try:
+            job = job_queue.submit(
+                labels, spec["num_simulations"], lambda job: run_simulation_request(spec, progress=job.advance)
+            )
+        except QueueFull as exc:
+            response = jsonify({"error": str(exc)})
+            response.headers["Retry-After"] = str(app.config["SIMULATION_JOB_RETRY_AFTER"])
+            return response, 503
+        response = jsonify(job.as_dict())
+        response.headers["Location"] = f"/simulate/jobs/{job.id}"
+        return response, 202
+
+    @app.route("/simulate/jobs/<job_id>", methods=["GET"])
+    def simulate_job_status(job_id):
+        job = job_queue.get(job_id)
+        if job is None:
+            return jsonify({"error": "unknown or expired job"}), 404
+        return jsonify(job.as_dict())
+
+    @app.route("/simulate/jobs/<job_id>/cancel", methods=["POST"])
+    def simulate_job_cancel(job_id):
+        job = job_queue.cancel(job_id)
+        if job is None:
+            return jsonify({"error": "unknown or expired job"}), 404
+        return jsonify(job.as_dict())
+
+    @app.route("/simulate/jobs/<job_id>/results", methods=["GET"])
+    def simulate_job_results(job_id):
+        job = job_queue.get(job_id)
+        if job is None:
+            return jsonify({"error": "unknown or expired job"}), 404
+        if job.status != "finished":
+            return jsonify(job.as_dict()), 409
+        with METRICS.stage("render"):
+            return render_template("results.html", **job.result)
+
+    @app.route("/api/estimate", methods=["POST"])
+    def api_estimate():
+        data = request.get_json() or {}
+        game_key = data.get("game") or "fair"
+        rounds = int(data.get("rounds") or 100_000)
+        methods = data.get("methods") or list(METHODS)
+        labels = dict(zip((key for key, _ in GAME_CHOICES), GAME_LABELS))
+        if game_key not in labels:
+            return jsonify({"error": f"unknown game {game_key!r}; expected one of {', '.join(labels)}"}), 400
+        if not 2 <= rounds <= app.config["BULK_MAX_ROUNDS"]:
+            return jsonify({"error": f"rounds must be between 2 and {app.config['BULK_MAX_ROUNDS']}"}), 400
+
+        # The game is built directly, so a "modified_payout" of 0 stays a 0x multiplier rather than a missing flag.
+        params = data.get("params") or {}
+        seed = data.get("seed")
+        estimates = []
+        for method in methods:
+            # Every method gets a fresh game on the same seed, so they are compared on equal terms.
+            game = build_game(labels[game_key], 1.0, params, seed)
+            try:
+                estimate = estimate_house_edge(game, rounds, method)
+            except ValueError as exc:
+                estimates.append({"method": method, "error": str(exc)})
+                continue
+            if math.isinf(estimate["variance_reduction"]):
+                estimate["variance_reduction"] = estimate["effective_sample_size"] = None
+            estimates.append(estimate)
+        return jsonify(
+            {
+                "game": labels[game_key],
+                "exact_house_edge": exact_statistics(game)["house_edge"],
+                "estimates": estimates,
+            }
         )
 
+    def checked_sweep(grid: dict, num_simulations: int, bet_amount: float, confidence: float, seed) -> dict:
+        points = 1
+        for values in grid.values():
+            points *= len(values)
+        if not grid or points == 0:
+            raise ValueError("the grid needs at least one value per parameter")
+        if points > app.config["SWEEP_MAX_POINTS"]:
+            raise ValueError(f"grid has {points} points; the limit is {app.config['SWEEP_MAX_POINTS']}")
+        if not 2 <= num_simulations <= app.config["SWEEP_MAX_ROUNDS"]:
+            raise ValueError(f"num_simulations must be between 2 and {app.config['SWEEP_MAX_ROUNDS']}")
+        return run_sweep(grid, num_simulations, bet_amount, confidence, seed)
+
+    @app.route("/sweep", methods=["GET", "POST"])
+    def sweep_page():
+        sweep, error = None, None
+        if request.method == "POST":
+            form = request.form
+            try:
+                grid = {
+                    form[f"parameter_{axis}"]: parse_values(form[f"values_{axis}"])
+                    for axis in (1, 2)
+                    if form.get(f"parameter_{axis}") and form.get(f"values_{axis}")
+                }
+                sweep = checked_sweep(
+                    grid,
+                    int(float(form.get("num_simulations") or 100_000)),
+                    float(form.get("bet_amount") or 1.0),
+                    float(form.get("confidence") or 0.95),
+                    int(form["seed"]) if form.get("seed") else None,
+                )
+            except ValueError as exc:
+                error = str(exc)
+        return render_template("sweep.html", parameters=SWEEP_PARAMETERS, sweep=sweep, error=error, form=request.form)
+
+    @app.route("/api/sweep", methods=["POST"])
+    def api_sweep():
+        data = request.get_json() or {}
+        try:
+            grid = {name: parse_values(values) for name, values in (data.get("grid") or {}).items()}
+            sweep = checked_sweep(
+                grid,
+                int(data.get("num_simulations") or 100_000),
+                float(data.get("bet_amount") or 1.0),
+                float(data.get("confidence") or 0.95),
+                data.get("seed"),
+            )
+        except (ValueError, KeyError, TypeError) as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify(sweep)
+
+    def stored_run(run_id: str):
+        manifest = run_store.manifest(run_id) if run_store else None
+        if manifest is None:
+            return None, None
+        return manifest, run_store.load(run_id)
+
+    @app.route("/runs/<run_id>", methods=["GET"])
+    def run_page(run_id):
+        manifest, results = stored_run(run_id)
+        if manifest is None:
+            return jsonify({"error": "unknown run"}), 404
+        spec = {
+            "num_simulations": manifest["num_simulations"],
+            "bet_amount": manifest["bet_amount"],
+            "params": manifest["params"],
+            "seed": manifest["seed"],
+            "mode": "full",
+            "streaming": False,
+            "target_precision": None,
+            "confidence": 0.95,
+            "chart_points": chart_points(request.args.get("chart_points")),
+        }
+        all_stats = {label: calculate_statistics_chunked(result) for label, result in results.items()}
+        context = results_context(spec, results, all_stats, stored=True)
+        with METRICS.stage("render"):
+            return render_template("results.html", **context, run_id=run_id)
+
+    @app.route("/api/runs", methods=["GET"])
+    def api_runs():
+        return jsonify({"runs": run_store.list() if run_store else []})
+
+    @app.route("/api/runs/<run_id>", methods=["GET"])
+    def api_run(run_id):
+        manifest, results = stored_run(run_id)
+        if manifest is None:
+            return jsonify({"error": "unknown run"}), 404
+        statistics = {}
+        for label, result in results.items():
+            # NaN percentiles (long runs summarized chunk by chunk) are not valid JSON.
+            statistics[label] = {
+                key: None if isinstance(value, float) and math.isnan(value) else value
+                for key, value in calculate_statistics_chunked(result).items()
+            }
+        return jsonify({**manifest, "statistics": statistics})
+
+    @app.route("/api/runs/<run_id>/export", methods=["GET"])
+    def api_run_export(run_id):
+        manifest, results = stored_run(run_id)
+        if manifest is None:
+            return jsonify({"error": "unknown run"}), 404
+        chunked = {label: result.chunks(100_000) for label, result in results.items()}
+        return export_response(chunked, f"run-{run_id}", {"X-Simulation-Seed": str(manifest["seed"])})
+
+    @app.route("/api/runs/<run_id>", methods=["DELETE"])
+    def api_run_delete(run_id):
+        if not (run_store and run_store.delete(run_id)):
+            return jsonify({"error": "unknown run"}), 404
+        return jsonify({"deleted": run_id})
+
+    @app.route("/api/simulate/cache", methods=["GET"])
+    def api_simulate_cache():
+        return jsonify(result_cache.stats())
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        cache_stats = result_cache.stats()
+        gauges = {
+            "metrics_enabled": ("1 when stage timers and counters are being recorded.", int(METRICS.enabled)),
+            "result_cache_entries": ("Entries in the /simulate result cache.", cache_stats["entries"]),
+            "result_cache_hits": ("Result cache hits since startup.", cache_stats["hits"]),
+            "result_cache_misses": ("Result cache misses since startup.", cache_stats["misses"]),
+            "result_cache_bytes": ("Bytes of round data held by the result cache.", cache_stats["bytes"]),
+            "simulation_jobs_pending": ("Background jobs queued or running.", job_queue.pending()),
+            "lucky9_open_hands": ("Open interactive Lucky 9 hands.", len(hand_store)),
+        }
+        return Response(METRICS.render(gauges), mimetype="text/plain; version=0.0.4")
+
     return app
 
 
@@ -0,0 +1,182 @@
+"""
+Bankroll / ruin simulation: many independent players, each with a finite
+bankroll, played round by round until they go broke, hit a stop or run out of rounds.
+"""
+
+import numpy as np
+from typing import Dict, Optional
+
+STRATEGIES = ("flat", "martingale", "fixed_fraction")
+# Outcome codes stored per player in BankrollResult.outcome.
+OUTCOMES = ("active", "ruined", "stop_loss", "stop_win")
+ACTIVE, RUINED, STOP_LOSS, STOP_WIN = range(len(OUTCOMES))
+
+
+class BankrollResult:
+    """
+    Per-player end state of a bankroll run: final bankroll, rounds played and
+    outcome code (index into OUTCOMES). Players still "active" reached max_rounds.
+    """
+
+    def __init__(
+        self,
+        final_bankroll: np.ndarray,
+        rounds_played: np.ndarray,
+        outcome: np.ndarray,
+        max_rounds: int,
+        starting_bankroll: float,
+    ):
+        self.final_bankroll = final_bankroll
+        self.rounds_played = rounds_played
+        self.outcome = outcome
+        self.max_rounds = max_rounds
+        self.starting_bankroll = starting_bankroll
+
+    def __len__(self) -> int:
+        return len(self.outcome)
+
+    @property
+    def ruin_times(self) -> np.ndarray:
+        return self.rounds_played[self.outcome == RUINED]
+
+    def survival_curve(self, points: int = 200) -> (np.ndarray, np.ndarray):
+        """
+        Share of players not yet ruined after each of `points` evenly spaced rounds.
+        """
+        rounds = np.unique(np.linspace(0, self.max_rounds, points).astype(np.int64))
+        ruined = np.sort(self.ruin_times)
+        return rounds, 1 - np.searchsorted(ruined, rounds, side="right") / len(self)
+
+    def summary(self) -> Dict[str, float]:
+        players = len(self)
+        counts = np.bincount(self.outcome, minlength=len(OUTCOMES))
+        ruin_times = self.ruin_times
+        stats = {
+            "players": players,
+            "ruin_probability": float(counts[RUINED] / players),
+            "stop_loss_probability": float(counts[STOP_LOSS] / players),
+            "stop_win_probability": float(counts[STOP_WIN] / players),
+            "survival_probability": float(counts[ACTIVE] / players),
+            "mean_rounds_played": float(self.rounds_played.mean()),
+            "mean_final_bankroll": float(self.final_bankroll.mean()),
+            "median_final_bankroll": float(np.median(self.final_bankroll)),
+        }
+        if len(ruin_times):
+            p10, p50, p90 = np.percentile(ruin_times, [10, 50, 90])
+            stats.update(
+                mean_time_to_ruin=float(ruin_times.mean()),
+                p10_time_to_ruin=float(p10),
+                median_time_to_ruin=float(p50),
+                p90_time_to_ruin=float(p90),
+            )
+        else:
+            stats.update(
+                mean_time_to_ruin=np.nan, p10_time_to_ruin=np.nan, median_time_to_ruin=np.nan, p90_time_to_ruin=np.nan
+            )
+        return stats
+
+
+def _payout_multipliers(game, shape) -> np.ndarray:
+    # Every game pays in proportion to the stake, so one batch at the game's bet gives payout/bet per round.
+    batch = game.play_batch(int(np.prod(shape)))
+    return (batch["payout"] / game.bet_amount).reshape(shape)
+
+
+def _finished(bankroll: np.ndarray, min_bet: float, loss_floor: float, win_ceiling: float) -> np.ndarray:
+    outcome = np.full(bankroll.shape, ACTIVE, dtype=np.int8)
+    outcome[bankroll >= win_ceiling] = STOP_WIN
+    outcome[bankroll <= loss_floor] = STOP_LOSS
+    outcome[bankroll < min_bet] = RUINED
+    return outcome
+
+
+def run_bankroll(
+    game,
+    num_players: int = 10000,
+    starting_bankroll: float = 100.0,
+    max_rounds: int = 10000,
+    stop_loss: Optional[float] = None,
+    stop_win: Optional[float] = None,
+    strategy: str = "flat",
+    base_bet: Optional[float] = None,
+    bet_fraction: float = 0.02,
+    block_size: int = 256,
+    label: str = "",
+    progress=None,
+) -> BankrollResult:
+    """
+    Play `num_players` independent bankrolls against `game`.
+
+    Rounds are drawn in blocks of (active players x block_size) payout
+    multipliers. Flat betting resolves a whole block with one cumulative sum;
+    martingale and fixed-fraction bets depend on the previous round, so they
+    step through the block's columns, still vectorized over players. Players
+    that finish are dropped from the next block.
+
+    A player is ruined when the bankroll can no longer cover the minimum bet
+    (`base_bet`, default the game's bet), stops after losing `stop_loss` or
+    winning `stop_win` in total, and otherwise plays until `max_rounds`.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}; expected one of {', '.join(STRATEGIES)}")
+    base_bet = float(base_bet or game.bet_amount)
+    loss_floor = starting_bankroll - stop_loss if stop_loss else -np.inf
+    win_ceiling = starting_bankroll + stop_win if stop_win else np.inf
+
+    final_bankroll = np.full(num_players, float(starting_bankroll))
+    rounds_played = np.zeros(num_players, dtype=np.int64)
+    outcome = _finished(final_bankroll, base_bet, loss_floor, win_ceiling)
+
+    active = np.flatnonzero(outcome == ACTIVE)
+    bankroll = final_bankroll[active]
+    # Martingale stake for the next round, per active player.
+    stake = np.full(len(active), base_bet)
+    played = 0
+    while len(active) and played < max_rounds:
+        width = min(block_size, max_rounds - played)
+        multipliers = _payout_multipliers(game, (len(active), width))
+
+        if strategy == "flat":
+            path = bankroll[:, None] + np.cumsum(base_bet * (multipliers - 1), axis=1)
+            status = _finished(path, base_bet, loss_floor, win_ceiling)
+            stopped = status != ACTIVE
+            done = stopped.any(axis=1)
+            # Column of the first stopping round, or the last column for players still going.
+            column = np.where(done, stopped.argmax(axis=1), width - 1)
+            rows = np.arange(len(active))
+            bankroll = path[rows, column]
+            block_outcome = status[rows, column]
+            block_rounds = column + 1
+        else:
+            block_outcome = np.full(len(active), ACTIVE, dtype=np.int8)
+            block_rounds = np.full(len(active), width, dtype=np.int64)
+            running = np.ones(len(active), dtype=bool)
+            for step in range(width):
+                if strategy == "martingale":
+                    bet = np.minimum(stake, bankroll)
+                else:
+                    bet = np.minimum(np.maximum(bet_fraction * bankroll, base_bet), bankroll)
+                profit = bet * (multipliers[:, step] - 1)
+                bankroll = np.where(running, bankroll + profit, bankroll)
+                if strategy == "martingale":
+                    # Double after a loss, reset after a win, keep the stake on a push.
+                    stake = np.where(profit < 0, 2 * stake, np.where(profit > 0, base_bet, stake))
+                status = _finished(bankroll, base_bet, loss_floor, win_ceiling)
+                newly_done = running & (status != ACTIVE)
+                block_outcome[newly_done] = status[newly_done]
+                block_rounds[newly_done] = step + 1
+                running &= ~newly_done
+                if not running.any():
+                    break
+
+        final_bankroll[active] = bankroll
+        rounds_played[active] += block_rounds
+        outcome[active] = block_outcome
+        played += width
+        if progress:
+            progress(label, width)
+
+        still = block_outcome == ACTIVE
+        active, bankroll, stake = active[still], bankroll[still], stake[still]
+
+    return BankrollResult(final_bankroll, rounds_played, outcome, max_rounds, starting_bankroll)
@@ -0,0 +1,121 @@
+"""
+Startup cost of a worker: importing the app, create_app, and the first request
+to each interactive route, measured in fresh interpreters.
+
+    python benchmarks/bench_startup.py --repeat 5
+
+"cold" is a fresh interpreter per worker (e.g. a serverless cold start or
+gunicorn without --preload). "forked" imports and prewarms the app once and
+forks workers from it, as gunicorn --preload does; each worker's time runs
+from fork() to the end of its first requests.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ROUTES = (
+    ("api_roll", "POST", "/api/roll", {"json": {"bet_color": "blue"}}),
+    ("api_lucky9", "POST", "/api/lucky9", {"json": {}}),
+    ("api_slot_spin", "POST", "/api/slot/spin", {"json": {}}),
+    ("simulate_page", "GET", "/run-simulation", {}),
+    ("simulate", "POST", "/simulate", {"data": {"games": ["fair", "slot_machine"], "num_simulations": "1000"}}),
+)
+
+
+def first_requests(app) -> dict:
+    client = app.test_client()
+    timings = {}
+    for name, method, path, kwargs in ROUTES:
+        start = time.perf_counter()
+        client.open(path, method=method, **kwargs).get_data()
+        timings[name] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def child(mode: str, workers: int) -> dict:
+    started = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    import app as app_module
+
+    imported = time.perf_counter()
+    app = app_module.create_app({"PREWARM_MODELS": mode != "cold-lazy"})
+    created = time.perf_counter()
+    report = {
+        "import_ms": (imported - started) * 1000,
+        "create_app_ms": (created - imported) * 1000,
+        "pandas_loaded": "pandas" in sys.modules,
+    }
+    if mode != "forked":
+        report["first_request_ms"] = first_requests(app)
+        report["worker_ready_ms"] = report["import_ms"] + report["create_app_ms"] + sum(
+            report["first_request_ms"].values()
+        )
+        return report
+
+    spawn = []
+    firsts = []
+    for _ in range(workers):
+        read_end, write_end = os.pipe()
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            os.write(write_end, json.dumps(first_requests(app)).encode())
+            os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end) as fh:
+            firsts.append(json.loads(fh.read()))
+        os.waitpid(pid, 0)
+        spawn.append((time.perf_counter() - forked_at) * 1000)
+    report["first_request_ms"] = {name: statistics.median(f[name] for f in firsts) for name, *_ in ROUTES}
+    report["worker_ready_ms"] = statistics.median(spawn)
+    return report
+
+
+def run(mode: str, workers: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--workers", str(workers)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4, help="workers forked per run in forked mode")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(child(args.child, args.workers)))
+        return
+
+    modes = ("cold-lazy", "cold", "forked")
+    if not hasattr(os, "fork"):
+        modes = modes[:2]
+    print(f"{'mode':<10} {'import':>8} {'create':>8} {'ready':>8}  first request (ms)")
+    for mode in modes:
+        reports = [run(mode, args.workers) for _ in range(args.repeat)]
+        import_ms = statistics.median(r["import_ms"] for r in reports)
+        create_ms = statistics.median(r["create_app_ms"] for r in reports)
+        ready_ms = statistics.median(r["worker_ready_ms"] for r in reports)
+        firsts = ", ".join(
+            f"{name}={statistics.median(r['first_request_ms'][name] for r in reports):.1f}" for name, *_ in ROUTES
+        )
+        pandas = " (pandas loaded)" if any(r["pandas_loaded"] for r in reports) else ""
+        print(f"{mode:<10} {import_ms:>8.1f} {create_ms:>8.1f} {ready_ms:>8.1f}  {firsts}{pandas}")
+    print("\ncold-lazy: PREWARM_MODELS off. forked: 'ready' is fork() to the end of the first requests.")
+
+
+if __name__ == "__main__":
+    main()
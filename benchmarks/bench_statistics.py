@@ -0,0 +1,71 @@
+"""
+Summary statistics: the original pandas path (build the DataFrame with its
+cumulative columns, then ~15 separate reductions) against the NumPy kernel.
+
+    python benchmarks/bench_statistics.py --sizes 100000 1000000 10000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from games import SlotMachineGame  # noqa: E402
+from simulation import calculate_statistics, run_simulation  # noqa: E402
+
+
+def pandas_statistics(df: pd.DataFrame) -> dict:
+    # calculate_statistics as it was before the NumPy kernel.
+    stats = {
+        "total_games": len(df),
+        "total_bet": df["player_bet"].sum(),
+        "wins": df["player_won"].sum(),
+        "losses": (df["player_won"] == False).sum(),  # noqa: E712
+        "win_rate": df["player_won"].mean(),
+        "total_player_profit": df["player_profit"].sum(),
+        "total_house_profit": df["house_profit"].sum(),
+        "avg_player_profit_per_game": df["player_profit"].mean(),
+        "avg_house_profit_per_game": df["house_profit"].mean(),
+        "final_player_balance": df["cumulative_player_profit"].iloc[-1],
+        "final_house_balance": df["cumulative_house_profit"].iloc[-1],
+        "max_player_profit": df["cumulative_player_profit"].max(),
+        "min_player_profit": df["cumulative_player_profit"].min(),
+        "max_house_profit": df["cumulative_house_profit"].max(),
+        "min_house_profit": df["cumulative_house_profit"].min(),
+    }
+    stats["std_player_profit"] = df["player_profit"].std()
+    stats["std_house_profit"] = df["house_profit"].std()
+    stats["player_roi"] = (stats["total_player_profit"] / stats["total_bet"]) * 100
+    stats["house_roi"] = (stats["total_house_profit"] / stats["total_bet"]) * 100
+    return stats
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rounds':>12} {'pandas (s)':>12} {'kernel (s)':>12} {'speedup':>9}")
+    for size in args.sizes:
+        result = run_simulation(SlotMachineGame(seed=1), size)
+        pandas_time = best_of(args.repeat, lambda: pandas_statistics(result.to_frame()))
+        kernel_time = best_of(args.repeat, lambda: calculate_statistics(result))
+        print(f"{size:>12,} {pandas_time:>12.4f} {kernel_time:>12.4f} {pandas_time / kernel_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Load test for the table engine: concurrent clients betting at shared tables.
+
+    python benchmarks/load_tables.py --clients 1 4 16 64 256 --duration 3
+    python benchmarks/load_tables.py --http --clients 1 8 32
+
+Every client is a thread that joins one of the --tables tables and bets in a
+loop, waiting --think-ms between bets to stand in for its network round trip.
+Each client count is run twice: micro-batched (TABLE_MAX_BATCH 4096) and with
+one bet per draw, so the gain from batching is visible next to the scaling.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import create_app  # noqa: E402
+from tables import TableEngine  # noqa: E402
+
+
+def engine_client(table, player: str):
+    def bet():
+        table.bet(player, 1.0)
+
+    return bet
+
+
+def http_client(client, table_id: str, player: str):
+    def bet():
+        response = client.post(f"/api/tables/{table_id}/bet", json={"player": player, "bet_amount": 1})
+        if response.status_code != 200:
+            raise RuntimeError(response.get_json())
+
+    return bet
+
+
+def run(clients: int, args, max_batch: int) -> dict:
+    if args.http:
+        app = create_app({"TABLE_MAX_BATCH": max_batch, "PREWARM_MODELS": False})
+        client = app.test_client()
+        table_ids = [
+            client.post("/api/tables", json={"game": args.game, "seed": index}).get_json()["table_id"]
+            for index in range(args.tables)
+        ]
+        tables = [app.extensions["game_tables"].get(table_id) for table_id in table_ids]
+    else:
+        engine = TableEngine(max_batch=max_batch)
+        tables = [engine.open(args.game, {}, seed=index) for index in range(args.tables)]
+
+    bets = []
+    for index in range(clients):
+        table = tables[index % len(tables)]
+        player = f"player-{index}"
+        table.join(player, 1e12)
+        bets.append(http_client(client, table.id, player) if args.http else engine_client(table, player))
+
+    think = args.think_ms / 1000
+    stop = threading.Event()
+    latencies = [[] for _ in range(clients)]
+
+    def loop(index: int) -> None:
+        bet = bets[index]
+        timings = latencies[index]
+        while not stop.is_set():
+            start = time.perf_counter()
+            bet()
+            timings.append(time.perf_counter() - start)
+            if think:
+                time.sleep(think)
+
+    threads = [threading.Thread(target=loop, args=(index,)) for index in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    timings = np.concatenate([np.asarray(t) for t in latencies]) * 1000
+    rounds = sum(table.rounds for table in tables)
+    batches = sum(table.batches for table in tables)
+    return {
+        "bets_per_sec": rounds / elapsed,
+        "mean_batch": rounds / batches if batches else 0.0,
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--tables", type=int, default=1)
+    parser.add_argument("--game", choices=("roll", "lucky9", "slot"), default="slot")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per run")
+    parser.add_argument("--think-ms", type=float, default=1.0, help="client pause between bets")
+    parser.add_argument("--http", action="store_true", help="bet through the Flask test client")
+    args = parser.parse_args()
+
+    print(
+        f"{'clients':>8} | {'batched bets/s':>14} {'batch':>7} {'p50 ms':>7} {'p99 ms':>7} | "
+        f"{'1-by-1 bets/s':>14} {'p99 ms':>7}"
+    )
+    for clients in args.clients:
+        batched = run(clients, args, max_batch=4096)
+        single = run(clients, args, max_batch=1)
+        print(
+            f"{clients:>8} | {batched['bets_per_sec']:>14,.0f} {batched['mean_batch']:>7.1f} "
+            f"{batched['p50_ms']:>7.2f} {batched['p99_ms']:>7.2f} | "
+            f"{single['bets_per_sec']:>14,.0f} {single['p99_ms']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
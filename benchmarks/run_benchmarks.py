@@ -0,0 +1,271 @@
+"""
+Benchmark suite: game throughput, the simulation engine and the HTTP routes.
+
+    python benchmarks/run_benchmarks.py --output benchmarks/results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --quick --save-baseline benchmarks/baseline.json
+
+Every measurement is one JSON record keyed by name. Against a baseline, a
+timing that grew by more than --tolerance (default 25%) is reported as a
+regression and the exit status is 1.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import create_app  # noqa: E402
+from games import (  # noqa: E402
+    ColorDiceGame,
+    FairDiceGame,
+    Lucky9Game,
+    ModifiedPayoutGame,
+    NormalDistributionGame,
+    SlotMachineGame,
+    TweakedDiceGame,
+    WeightedProbabilitiesGame,
+)
+from simulation import calculate_statistics, run_games, run_simulation  # noqa: E402
+
+GAMES = {
+    "fair": FairDiceGame,
+    "tweaked": TweakedDiceGame,
+    "weighted": WeightedProbabilitiesGame,
+    "modified_payout": ModifiedPayoutGame,
+    "normal_dist": NormalDistributionGame,
+    "lucky9": Lucky9Game,
+    "slot_machine": SlotMachineGame,
+    "color_dice": lambda seed: ColorDiceGame(mode="tweaked", bet_color="blue", seed=seed),
+}
+ALL_GAMES = {key: True for key in GAMES if key != "color_dice"}
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+QUICK_SIZES = [1_000, 10_000, 100_000]
+# play() runs one Python call per round, so it stops at this size.
+MAX_SCALAR_ROUNDS = 100_000
+# Timings (keys) compared against the baseline; lower is better for all of them.
+COMPARED = ("seconds", "p50_ms", "p99_ms")
+# Baseline timings below this many seconds are too noisy to flag.
+MIN_COMPARED_SECONDS = 0.005
+
+
+def timed(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_games(sizes, repeat: int) -> dict:
+    results = {}
+    for key, factory in GAMES.items():
+        for size in sizes:
+            game = factory(seed=1)
+            if size <= MAX_SCALAR_ROUNDS:
+                seconds = timed(lambda: [game.play() for _ in range(size)], repeat=1 if size >= 10_000 else repeat)
+                results[f"game.{key}.play.{size}"] = {"seconds": seconds, "rounds_per_sec": size / seconds}
+            if hasattr(game, "play_batch"):
+                seconds = timed(lambda: game.play_batch(size), repeat)
+                results[f"game.{key}.play_batch.{size}"] = {"seconds": seconds, "rounds_per_sec": size / seconds}
+    return results
+
+
+def bench_engine(sizes, repeat: int) -> dict:
+    results = {}
+    for size in sizes:
+        result = run_simulation(SlotMachineGame(seed=1), size)
+        for name, func in (
+            ("run_simulation", lambda: run_simulation(SlotMachineGame(seed=1), size)),
+            ("run_games", lambda: run_games(size, 1.0, ALL_GAMES, seed=1)),
+            ("calculate_statistics", lambda: calculate_statistics(result)),
+        ):
+            results[f"engine.{name}.{size}"] = {
+                "seconds": timed(func, repeat),
+                "peak_bytes": peak_memory(func),
+            }
+    return results
+
+
+def latency(client, method: str, path: str, requests: int, **kwargs) -> dict:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        response.get_data()
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} returned {response.status_code}")
+    p50, p99 = np.percentile(timings, [50, 99]).tolist()
+    return {"p50_ms": p50, "p99_ms": p99, "requests": requests}
+
+
+def bench_routes(requests: int) -> dict:
+    with tempfile.TemporaryDirectory() as run_store:
+        return _bench_routes(requests, run_store)
+
+
+def _bench_routes(requests: int, run_store: str) -> dict:
+    client = create_app({"RESULT_CACHE_SIZE": 0, "RUN_STORE_DIR": run_store}).test_client()
+    hand_id = client.post("/api/lucky9/peek", json={}).get_json()["hand_id"]
+    table_id = client.post("/api/tables", json={"game": "slot", "seed": 1}).get_json()["table_id"]
+    client.post(f"/api/tables/{table_id}/join", json={"player": "bench", "buy_in": 1e12})
+    # Exports format every round in Python, so the stored run and the exports use a smaller run than /simulate.
+    simulate_form = {"games": list(ALL_GAMES), "num_simulations": "20000", "seed": "1"}
+    client.post("/simulate", data={**simulate_form, "save_run": "1"})
+    run_id = client.get("/api/runs").get_json()["runs"][0]["run_id"]
+
+    def lucky9_hand():
+        hand = client.post("/api/lucky9/peek", json={"bet_amount": 2}).get_json()["hand_id"]
+        client.post("/api/lucky9/draw", json={"hand_id": hand})
+        return client.post("/api/lucky9/resolve", json={"hand_id": hand})
+
+    routes = {
+        "route.api_roll": ("POST", "/api/roll", {"json": {"bet_color": "blue", "mode": "tweaked"}}),
+        "route.api_lucky9": ("POST", "/api/lucky9", {"json": {"bet_amount": 2}}),
+        "route.api_lucky9_peek": ("POST", "/api/lucky9/peek", {"json": {}}),
+        "route.api_slot_spin": ("POST", "/api/slot/spin", {"json": {"bet_amount": 1}}),
+        "route.api_bulk_ndjson": ("POST", "/api/bulk", {"json": {"game": "slot", "count": 10_000}}),
+        "route.api_bulk_binary": (
+            "POST",
+            "/api/bulk",
+            {"json": {"game": "slot", "count": 100_000, "format": "binary"}},
+        ),
+        "route.api_estimate": ("POST", "/api/estimate", {"json": {"game": "slot_machine", "rounds": 100_000}}),
+        "route.api_sweep": ("POST", "/api/sweep", {"json": {"grid": {"tweaked_payout": [4, 5, 6]}}}),
+        "route.api_simulate_cache": ("GET", "/api/simulate/cache", {}),
+        "route.simulate_full": (
+            "POST",
+            "/simulate",
+            {"data": {"games": list(ALL_GAMES), "num_simulations": "100000"}},
+        ),
+        "route.simulate_streaming": (
+            "POST",
+            "/simulate",
+            {"data": {"games": list(ALL_GAMES), "num_simulations": "100000", "mode": "streaming"}},
+        ),
+        "route.simulate_export_csv": ("POST", "/simulate/export?format=csv", {"data": simulate_form}),
+        "route.simulate_export_ndjson": ("POST", "/simulate/export?format=ndjson", {"data": simulate_form}),
+        "route.api_tables_open": ("POST", "/api/tables", {"json": {"game": "roll"}}),
+        "route.api_table": ("GET", f"/api/tables/{table_id}", {}),
+        "route.api_table_bet": (
+            "POST",
+            f"/api/tables/{table_id}/bet",
+            {"json": {"player": "bench", "bet_amount": 1}},
+        ),
+        "route.api_runs": ("GET", "/api/runs", {}),
+        "route.api_run": ("GET", f"/api/runs/{run_id}", {}),
+        "route.api_run_export": ("GET", f"/api/runs/{run_id}/export?format=csv", {}),
+        "route.run_page": ("GET", f"/runs/{run_id}", {}),
+    }
+    results = {}
+    for name, (method, path, kwargs) in routes.items():
+        heavy = not path.startswith("/api/") or "bulk" in path or "export" in path
+        count = max(requests // 10, 5) if heavy else requests
+        results[name] = latency(client, method, path, count, **kwargs)
+
+    # Draw needs an open hand and resolve closes it, so the three-step hand is timed as one unit.
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        lucky9_hand()
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p99 = np.percentile(timings, [50, 99]).tolist()
+    results["route.api_lucky9_hand"] = {"p50_ms": p50, "p99_ms": p99, "requests": requests}
+    client.post("/api/lucky9/resolve", json={"hand_id": hand_id})
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, record in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for key in COMPARED:
+            floor = MIN_COMPARED_SECONDS * (1000 if key.endswith("_ms") else 1)
+            if key in record and key in previous and previous[key] >= floor:
+                ratio = record[key] / previous[key]
+                record[f"{key}_vs_baseline"] = ratio
+                if ratio > 1 + tolerance:
+                    regressions.append(f"{name} {key}: {previous[key]:.4g} -> {record[key]:.4g} ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the games, the simulation engine and the routes.")
+    parser.add_argument("--sizes", type=int, nargs="+", help="round counts (default 1e3 to 1e7)")
+    parser.add_argument("--quick", action="store_true", help="sizes up to 1e5 and fewer requests")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of repeats per timing")
+    parser.add_argument("--requests", type=int, default=200, help="requests per API route")
+    parser.add_argument("--only", choices=("games", "engine", "routes"), nargs="+")
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", help="also write the results here")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    requests = min(args.requests, 50) if args.quick else args.requests
+    sections = args.only or ("games", "engine", "routes")
+
+    results = {}
+    if "games" in sections:
+        results.update(bench_games(sizes, args.repeat))
+    if "engine" in sections:
+        results.update(bench_engine(sizes, args.repeat))
+    if "routes" in sections:
+        results.update(bench_routes(requests))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(results, json.load(fh)["results"], args.tolerance)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "sizes": sizes,
+        "results": results,
+        "regressions": regressions,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+
+    width = max(len(name) for name in results) if results else 0
+    for name, record in sorted(results.items()):
+        shown = ", ".join(
+            f"{key}={value:.4g}" for key, value in record.items() if isinstance(value, float) or key == "peak_bytes"
+        )
+        print(f"{name:<{width}}  {shown}")
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Bulk rounds for the interactive games: one vectorized batch per request,
+streamed back as NDJSON or a binary .npy record array.
+"""
+
+import io
+import json
+import numpy as np
+from typing import Dict, Iterator, Optional
+
+from games import COLORS, shared_game, with_seed
+
+BULK_GAMES = ("roll", "lucky9", "slot")
+
+
+def bulk_game(game: str, params: dict, seed: Optional[int] = None):
+    """
+    Shared unit-bet game for a bulk request, keyed like the single-round endpoints.
+    """
+    if game == "roll":
+        bet_color = (params.get("bet_color") or "red").lower()
+        if bet_color not in COLORS:
+            raise ValueError("invalid bet color")
+        mode = (params.get("mode") or "fair").lower()
+        if mode in ("tweaked", "weighted"):
+            key = (mode, bet_color, max(0.05, min(float(params.get("chosen_prob") or 0.18), 0.3)))
+        else:
+            key = ("fair", bet_color)
+    elif game == "lucky9":
+        key = ("lucky9", None, None, float(params.get("payout_multiplier") or 2.0))
+    elif game == "slot":
+        key = ("slot",)
+    else:
+        raise ValueError(f"unknown game {game!r}; expected one of {', '.join(BULK_GAMES)}")
+
+    instance = shared_game(*key)
+    return with_seed(instance, seed) if seed is not None else instance
+
+
+def run_bulk(game: str, params: dict, count: int, bet_amount: float, seed: Optional[int] = None):
+    """
+    Play `count` rounds in one batch. Returns the record array and a summary dict.
+    """
+    instance = bulk_game(game, params, seed)
+    batch = instance.play_batch(count)
+    payout = bet_amount * batch["payout"]
+
+    if game == "roll":
+        outcome = [("dice", "u1", (3,)), ("matches", "u1")]
+        values = {"dice": batch["dice_codes"], "matches": batch["matches"]}
+    elif game == "lucky9":
+        outcome = [
+            ("player_cards", "i1", (2,)),
+            ("dealer_cards", "i1", (2,)),
+            ("player_total", "u1"),
+            ("dealer_total", "u1"),
+        ]
+        values = {key: batch[key] for key, *_ in outcome}
+    else:
+        outcome = [("reels", "u1", (3,))]
+        values = {"reels": batch["spin_codes"]}
+
+    records = np.empty(count, dtype=outcome + [("payout", "f8"), ("player_profit", "f8"), ("player_won", "?")])
+    for key, column in values.items():
+        records[key] = column
+    records["payout"] = payout
+    records["player_profit"] = payout - bet_amount
+    records["player_won"] = batch["player_won"]
+
+    total_bet = bet_amount * count
+    total_payout = float(payout.sum())
+    summary = {
+        "game": game,
+        "count": count,
+        "bet_amount": bet_amount,
+        "total_bet": total_bet,
+        "total_payout": round(total_payout, 2),
+        "player_profit": round(total_payout - total_bet, 2),
+        "house_profit": round(total_bet - total_payout, 2),
+        "win_rate": float(batch["player_won"].mean()) if count else 0.0,
+        "house_roi": (total_bet - total_payout) / total_bet * 100 if count else 0.0,
+        "seed": instance.seed if seed is not None else None,
+    }
+    return records, summary
+
+
+def _row_formatter(game: str):
+    if game == "roll":
+        return lambda row: {"dice": [COLORS[int(code)] for code in row[0]], "matches": row[1]}
+    if game == "lucky9":
+        return lambda row: {
+            "player_cards": [int(card) for card in row[0]],
+            "dealer_cards": [int(card) for card in row[1]],
+            "player_total": row[2],
+            "dealer_total": row[3],
+        }
+    symbols = shared_game("slot").model.symbol_list
+    return lambda row: {"spin": [symbols[int(code)] for code in row[0]]}
+
+
+def iter_ndjson(game: str, records: np.ndarray, summary: Dict, chunk_size: int = 10_000) -> Iterator[str]:
+    outcome = _row_formatter(game)
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start : start + chunk_size]
+        lines = []
+        for offset, row in enumerate(chunk.tolist()):
+            line = outcome(row)
+            line["round"] = start + offset + 1
+            line["payout"] = round(row[-3], 2)
+            line["player_profit"] = round(row[-2], 2)
+            lines.append(json.dumps(line))
+        yield "\n".join(lines) + "\n"
+    yield json.dumps({"summary": summary}) + "\n"
+
+
+def iter_npy(records: np.ndarray, chunk_size: int = 65536) -> Iterator[bytes]:
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, np.lib.format.header_data_from_array_1_0(records))
+    yield header.getvalue()
+    for start in range(0, len(records), chunk_size):
+        yield records[start : start + chunk_size].tobytes()
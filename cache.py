@@ -0,0 +1,175 @@
+"""
+Bounded result cache for /simulate runs.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def value_nbytes(value) -> int:
+    """
+    Approximate bytes held by a cached value: the array data reachable through
+    dicts, lists, tuples and object attributes. Objects that report `nbytes`
+    themselves are trusted.
+    """
+    if isinstance(value, np.ndarray) or hasattr(type(value), "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(value_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(value_nbytes(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return value_nbytes(vars(value))
+    return 0
+
+
+class ResultCache:
+    """
+    LRU cache of simulation outputs with TTL eviction, bounded by entry count
+    and by the bytes of array data held. A value larger than `max_entry_bytes`
+    is not cached at all, so one huge run neither flushes the cache nor is
+    pickled to disk inside the request.
+    Entries are kept in memory and, when `directory` is set, pickled to disk so
+    they survive restarts and can be shared by workers on the same host.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 16,
+        ttl: float = 3600.0,
+        directory: Optional[str] = None,
+        max_bytes: int = 256 * 2**20,
+        max_entry_bytes: Optional[int] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 4 if max_entry_bytes is None else max_entry_bytes
+        self.ttl = ttl
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.nbytes = 0
+        # key -> (expires_at, value, nbytes)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(params: dict, num_simulations: int, bet_amount: float, seed: int, **extra) -> str:
+        normalized = {
+            key: value if isinstance(value, bool) else float(value) for key, value in sorted(params.items())
+        }
+        payload = {
+            "params": normalized,
+            "num_simulations": int(num_simulations),
+            "bet_amount": float(bet_amount),
+            "seed": int(seed),
+            **extra,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._discard(key)
+
+        value = self._load(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value, value_nbytes(value), now)
+            return value
+
+    def set(self, key: str, value) -> bool:
+        """
+        Cache `value` under `key`; returns False when it is too large to cache.
+        """
+        nbytes = value_nbytes(value)
+        now = time.time()
+        with self._lock:
+            if nbytes > self.max_entry_bytes:
+                self.skipped += 1
+                return False
+            self._store(key, value, nbytes, now)
+        if self.directory:
+            tmp = self._path(key).with_suffix(".tmp")
+            with open(tmp, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        return True
+
+    def _store(self, key: str, value, nbytes: int, now: float) -> None:
+        self._discard(key)
+        self._entries[key] = (now + self.ttl, value, nbytes)
+        self.nbytes += nbytes
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    def _load(self, key: str, now: float):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            if path.stat().st_mtime + self.ttl <= now:
+                path.unlink()
+                return None
+            with open(path, "rb") as fh:
+                return pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+        if self.directory:
+            for path in self.directory.glob("*.pkl"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "max_entry_bytes": self.max_entry_bytes,
+                "skipped": self.skipped,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
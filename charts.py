@@ -0,0 +1,100 @@
+"""
+Downsampling helpers for chart series sent to the browser.
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Smallest budgets that still downsample: both endpoints plus one bucket's low and
+# high for the envelope, both endpoints plus one pick for LTTB. Smaller budgets are
+# raised to these rather than returning the full series.
+MIN_ENVELOPE_POINTS = 4
+MIN_LTTB_POINTS = 3
+
+
+def minmax_envelope(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the lowest and highest point of each equal-width bucket (plus both
+    endpoints), so peaks and drawdown extremes survive. Fully vectorized.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    max_points = max(max_points, MIN_ENVELOPE_POINTS)
+    if n <= max_points:
+        return x, y
+
+    buckets = (max_points - 2) // 2
+    bucket_size = -(-n // buckets)
+    # Pad with the last value so the series reshapes into whole buckets.
+    padded = np.concatenate([y, np.full(buckets * bucket_size - n, y[-1])]).reshape(buckets, bucket_size)
+    offsets = np.arange(buckets) * bucket_size
+    lows = offsets + padded.argmin(axis=1)
+    highs = offsets + padded.argmax(axis=1)
+
+    keep = np.unique(np.concatenate([[0, n - 1], np.minimum(lows, n - 1), np.minimum(highs, n - 1)]))
+    return x[keep], y[keep]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets: one point per bucket, chosen to maximise the
+    triangle it forms with the previous pick and the next bucket's mean.
+    Loops over buckets only; the work inside each bucket is vectorized.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    max_points = max(max_points, MIN_LTTB_POINTS)
+    if n <= max_points:
+        return x, y
+
+    xf = x.astype(float)
+    yf = y.astype(float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_start, next_stop = stop, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        if next_stop <= next_start:
+            next_stop = next_start + 1
+        mean_x = xf[next_start:next_stop].mean()
+        mean_y = yf[next_start:next_stop].mean()
+        area = np.abs(
+            (xf[previous] - mean_x) * (yf[start:stop] - yf[previous])
+            - (xf[previous] - xf[start:stop]) * (mean_y - yf[previous])
+        )
+        previous = start + int(area.argmax())
+        keep[bucket + 1] = previous
+    return x[keep], y[keep]
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: str = "minmax") -> Tuple[np.ndarray, np.ndarray]:
+    if method == "lttb":
+        return lttb(x, y, max_points)
+    return minmax_envelope(x, y, max_points)
+
+
+def downsample_cumulative(
+    increments: np.ndarray, max_points: int, method: str = "minmax", chunk_size: int = 4_000_000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsampled running total of `increments` against the 1-based round number.
+    Series longer than `chunk_size` are summed and reduced one chunk at a time,
+    then reduced again, so the full cumulative array is never built.
+    """
+    n = len(increments)
+    if n <= chunk_size:
+        return downsample(np.arange(1, n + 1), np.cumsum(increments), max_points, method)
+    xs, ys = [], []
+    offset = 0.0
+    for start in range(0, n, chunk_size):
+        running = offset + np.cumsum(increments[start : start + chunk_size])
+        offset = float(running[-1])
+        x, y = downsample(np.arange(start + 1, start + len(running) + 1), running, max_points, method)
+        xs.append(x)
+        ys.append(y)
+    return downsample(np.concatenate(xs), np.concatenate(ys), max_points, method)
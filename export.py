@@ -0,0 +1,173 @@
+"""
+Streaming export of simulation runs: every round, or one summary row per
+chunk, as CSV, NDJSON or Arrow IPC. Rows are produced one simulation chunk at
+a time, so memory stays flat however many rounds are exported.
+"""
+
+import io
+import json
+import numpy as np
+from typing import Dict, Iterable, Iterator
+
+from simulation import SimulationResult, balance_extremes
+
+EXPORT_FORMATS = ("csv", "ndjson", "arrow")
+EXPORT_LEVELS = ("rounds", "chunks")
+MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson", "arrow": "application/vnd.apache.arrow.stream"}
+
+# Column name -> printf format; "game" is filled in per table.
+ROUND_COLUMNS = {
+    "game": "%s",
+    "round": "%d",
+    "player_bet": "%.12g",
+    "payout": "%.12g",
+    "player_profit": "%.12g",
+    "house_profit": "%.12g",
+    "player_won": "%s",
+    "cumulative_player_profit": "%.12g",
+}
+CHUNK_COLUMNS = {
+    "game": "%s",
+    "chunk": "%d",
+    "first_round": "%d",
+    "rounds": "%d",
+    "wins": "%d",
+    "total_bet": "%.12g",
+    "player_profit": "%.12g",
+    "house_profit": "%.12g",
+    "cumulative_player_profit": "%.12g",
+    "max_player_drawdown": "%.12g",
+}
+
+
+def iter_tables(chunked: Dict[str, Iterable[SimulationResult]], level: str = "rounds") -> Iterator[Dict]:
+    """
+    One {"game": label, column: array, ...} table per simulation chunk. `chunked`
+    maps each game label to its chunks in round order; the cumulative balance
+    carries across chunk boundaries.
+    """
+    if level not in EXPORT_LEVELS:
+        raise ValueError(f"unknown level {level!r}; expected one of {', '.join(EXPORT_LEVELS)}")
+    for label, chunks in chunked.items():
+        balance = 0.0
+        first_round = 1
+        for index, chunk in enumerate(chunks):
+            size = len(chunk)
+            if size == 0:
+                continue
+            if level == "rounds":
+                cumulative = balance + np.cumsum(chunk.player_profit)
+                yield {
+                    "game": label,
+                    "round": np.arange(first_round, first_round + size),
+                    **{column: getattr(chunk, column) for column in SimulationResult.columns},
+                    "cumulative_player_profit": cumulative,
+                }
+                balance = float(cumulative[-1])
+            else:
+                final, _, _, drawdown, _ = balance_extremes(chunk.player_profit)
+                balance += final
+                yield {
+                    "game": label,
+                    "chunk": np.array([index]),
+                    "first_round": np.array([first_round]),
+                    "rounds": np.array([size]),
+                    "wins": np.array([int(chunk.player_won.sum())]),
+                    "total_bet": np.array([chunk.player_bet.sum()]),
+                    "player_profit": np.array([chunk.player_profit.sum()]),
+                    "house_profit": np.array([chunk.house_profit.sum()]),
+                    "cumulative_player_profit": np.array([balance]),
+                    "max_player_drawdown": np.array([drawdown]),
+                }
+            first_round += size
+
+
+def _columns(level: str) -> Dict[str, str]:
+    return ROUND_COLUMNS if level == "rounds" else CHUNK_COLUMNS
+
+
+def _format_column(values: np.ndarray, fmt: str, booleans) -> list:
+    """
+    One string per value. Bets, payouts and profits take a handful of distinct
+    values, so each distinct value is formatted once and looked up.
+    """
+    if values.dtype == bool:
+        return np.where(values, *booleans).tolist()
+    if len(values) > 1024:
+        distinct, inverse = np.unique(values, return_inverse=True)
+        if len(distinct) <= 1024:
+            return np.array([fmt % value for value in distinct.tolist()], dtype=object)[inverse].tolist()
+    return list(map(fmt.__mod__, values.tolist()))
+
+
+def _format_rows(table: Dict, formats: Dict[str, str], template: str, booleans) -> str:
+    # The game label is constant per table, so it goes into the template instead of every row.
+    template = template.replace("%%game%%", table["game"].replace("%", "%%"))
+    values = [_format_column(table[name], fmt, booleans) for name, fmt in formats.items() if name != "game"]
+    return "\n".join(map(template.__mod__, zip(*values))) + "\n"
+
+
+def iter_csv(tables: Iterable[Dict], level: str = "rounds") -> Iterator[str]:
+    formats = _columns(level)
+    yield ",".join(formats) + "\n"
+    template = ",".join("%%game%%" if name == "game" else "%s" for name in formats)
+    for table in tables:
+        yield _format_rows(table, formats, template, ("True", "False"))
+
+
+def iter_ndjson(tables: Iterable[Dict], level: str = "rounds") -> Iterator[str]:
+    formats = _columns(level)
+    fields = []
+    for name in formats:
+        value = '"%%game%%"' if name == "game" else "%s"
+        fields.append(f'"{name}": {value}')
+    template = "{" + ", ".join(fields) + "}"
+    for table in tables:
+        # json.dumps escapes the label; its surrounding quotes come from the template.
+        yield _format_rows({**table, "game": json.dumps(table["game"])[1:-1]}, formats, template, ("true", "false"))
+
+
+def iter_arrow(tables: Iterable[Dict], level: str = "rounds") -> Iterator[bytes]:
+    """
+    Arrow IPC stream, one record batch per table. pyarrow is optional; it is
+    imported here so a missing install fails before the response starts.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise RuntimeError("Arrow export needs the optional pyarrow package") from exc
+
+    def batches() -> Iterator[bytes]:
+        sink = io.BytesIO()
+        writer = None
+        for table in tables:
+            size = len(table["rounds" if level == "chunks" else "round"])
+            columns = {
+                name: pa.repeat(table["game"], size) if name == "game" else pa.array(table[name])
+                for name in _columns(level)
+            }
+            batch = pa.RecordBatch.from_pydict(columns)
+            if writer is None:
+                writer = pa.ipc.new_stream(sink, batch.schema)
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+        if writer is not None:
+            writer.close()
+            yield sink.getvalue()
+
+    return batches()
+
+
+def iter_export(chunked: Dict[str, Iterable[SimulationResult]], output: str = "csv", level: str = "rounds"):
+    """
+    Export in `output` format. Arguments are checked here, before the first
+    chunk is simulated, so bad requests fail before the response starts.
+    """
+    formatters = {"csv": iter_csv, "ndjson": iter_ndjson, "arrow": iter_arrow}
+    if output not in formatters:
+        raise ValueError(f"unknown format {output!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    if level not in EXPORT_LEVELS:
+        raise ValueError(f"unknown level {level!r}; expected one of {', '.join(EXPORT_LEVELS)}")
+    return formatters[output](iter_tables(chunked, level), level)
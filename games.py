@@ -2,18 +2,45 @@
 Game models for the Flask betting simulator.
 """
 
+import bisect
+import copy
+import os
+import weakref
+from functools import lru_cache
+
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional, Tuple, Union
+
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def new_seed() -> int:
+    # 32 bits keeps echoed seeds exact in JSON/JavaScript clients.
+    return int(np.random.SeedSequence().generate_state(1)[0])
+
+
+def make_rng(seed: SeedLike = None) -> Tuple[np.random.Generator, Optional[int]]:
+    """
+    Build a PCG64 Generator for a game.
+    Returns the generator and the integer seed that replays it; a fresh seed is
+    drawn when none is given, and None is returned for a SeedSequence or Generator.
+    """
+    if seed is None:
+        seed = new_seed()
+    if isinstance(seed, (np.random.Generator, np.random.SeedSequence)):
+        return np.random.default_rng(seed), None
+    return np.random.default_rng(int(seed)), int(seed)
 
 
 class DiceGame:
-    def __init__(self, sides: int = 6, bet_amount: float = 1.0):
+    def __init__(self, sides: int = 6, bet_amount: float = 1.0, seed: SeedLike = None):
         self.sides = sides
         self.bet_amount = bet_amount
+        self.rng, self.seed = make_rng(seed)
 
     def play(self) -> Dict[str, float]:
-        player_choice = np.random.randint(1, self.sides + 1)
-        dice_roll = np.random.randint(1, self.sides + 1)
+        player_choice = self.rng.integers(1, self.sides + 1)
+        dice_roll = self.rng.integers(1, self.sides + 1)
         player_won = dice_roll == player_choice
         payout = self._calculate_payout(player_won)
         player_profit = payout - self.bet_amount
@@ -28,13 +55,31 @@ class DiceGame:
             "house_profit": house_profit,
         }
 
+    def play_batch(self, n: int) -> Dict[str, np.ndarray]:
+        player_choice = self.rng.integers(1, self.sides + 1, size=n)
+        dice_roll = self.rng.integers(1, self.sides + 1, size=n)
+        player_won = dice_roll == player_choice
+        payout = self._calculate_payouts(player_won)
+        return {
+            "player_bet": np.full(n, self.bet_amount, dtype=float),
+            "dice_roll": dice_roll,
+            "player_choice": player_choice,
+            "player_won": player_won,
+            "payout": payout,
+            "player_profit": payout - self.bet_amount,
+            "house_profit": self.bet_amount - payout,
+        }
+
     def _calculate_payout(self, player_won: bool) -> float:
         raise NotImplementedError
 
+    def _calculate_payouts(self, player_won: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
 
 class FairDiceGame(DiceGame):
-    def __init__(self, sides: int = 6, bet_amount: float = 1.0):
-        super().__init__(sides, bet_amount)
+    def __init__(self, sides: int = 6, bet_amount: float = 1.0, seed: SeedLike = None):
+        super().__init__(sides, bet_amount, seed)
         self.payout_multiplier = sides
 
     def _calculate_payout(self, player_won: bool) -> float:
@@ -42,10 +87,15 @@ class FairDiceGame(DiceGame):
             return self.bet_amount * self.payout_multiplier
         return 0.0
 
+    def _calculate_payouts(self, player_won: np.ndarray) -> np.ndarray:
+        return np.where(player_won, self.bet_amount * self.payout_multiplier, 0.0)
+
 
 class TweakedDiceGame(DiceGame):
-    def __init__(self, sides: int = 6, bet_amount: float = 1.0, payout_multiplier: float = 5.0):
-        super().__init__(sides, bet_amount)
+    def __init__(
+        self, sides: int = 6, bet_amount: float = 1.0, payout_multiplier: float = 5.0, seed: SeedLike = None
+    ):
+        super().__init__(sides, bet_amount, seed)
         self.payout_multiplier = payout_multiplier
 
     def _calculate_payout(self, player_won: bool) -> float:
@@ -53,27 +103,34 @@ class TweakedDiceGame(DiceGame):
             return self.bet_amount * self.payout_multiplier
         return 0.0
 
+    def _calculate_payouts(self, player_won: np.ndarray) -> np.ndarray:
+        return np.where(player_won, self.bet_amount * self.payout_multiplier, 0.0)
+
 
 def calculate_house_edge(win_probability: float, payout_multiplier: float) -> float:
     return (1 - (win_probability * payout_multiplier)) * 100
 
 
 class WeightedProbabilitiesGame(DiceGame):
-    def __init__(self, sides: int = 6, bet_amount: float = 1.0, player_number_weight: float = 0.12):
-        super().__init__(sides, bet_amount)
+    def __init__(
+        self, sides: int = 6, bet_amount: float = 1.0, player_number_weight: float = 0.12, seed: SeedLike = None
+    ):
+        super().__init__(sides, bet_amount, seed)
         self.player_number_weight = player_number_weight
         self.payout_multiplier = sides
 
+        # Row c-1 is the roll CDF when the player picked c; built once instead of every round.
+        remaining_weight = (1.0 - player_number_weight) / (sides - 1)
+        probabilities = np.full((sides, sides), remaining_weight)
+        np.fill_diagonal(probabilities, player_number_weight)
+        probabilities = probabilities / probabilities.sum(axis=1, keepdims=True)
+        self.roll_cdf = np.cumsum(probabilities, axis=1)
+        self.roll_cdf[:, -1] = 1.0
+        self._roll_cdf_rows = self.roll_cdf.tolist()
+
     def play(self) -> Dict[str, float]:
-        player_choice = np.random.randint(1, self.sides + 1)
-        remaining_weight = (1.0 - self.player_number_weight) / (self.sides - 1)
-        probabilities = [remaining_weight] * self.sides
-        probabilities[player_choice - 1] = self.player_number_weight
-        probabilities = np.array(probabilities)
-        probabilities = probabilities / probabilities.sum()
-
-        outcomes = np.arange(1, self.sides + 1)
-        dice_roll = np.random.choice(outcomes, p=probabilities)
+        player_choice = int(self.rng.integers(1, self.sides + 1))
+        dice_roll = bisect.bisect_right(self._roll_cdf_rows[player_choice - 1], self.rng.random()) + 1
         player_won = dice_roll == player_choice
         payout = self._calculate_payout(player_won)
         player_profit = payout - self.bet_amount
@@ -88,15 +145,39 @@ class WeightedProbabilitiesGame(DiceGame):
             "house_profit": house_profit,
         }
 
+    def play_batch(self, n: int) -> Dict[str, np.ndarray]:
+        # The player's number comes up with probability player_number_weight;
+        # otherwise the roll is uniform over the remaining sides.
+        player_choice = self.rng.integers(1, self.sides + 1, size=n)
+        player_won = self.rng.random(n) < self.player_number_weight
+        other = self.rng.integers(1, self.sides, size=n)
+        other = other + (other >= player_choice)
+        dice_roll = np.where(player_won, player_choice, other)
+        payout = self._calculate_payouts(player_won)
+        return {
+            "player_bet": np.full(n, self.bet_amount, dtype=float),
+            "dice_roll": dice_roll,
+            "player_choice": player_choice,
+            "player_won": player_won,
+            "payout": payout,
+            "player_profit": payout - self.bet_amount,
+            "house_profit": self.bet_amount - payout,
+        }
+
     def _calculate_payout(self, player_won: bool) -> float:
         if player_won:
             return self.bet_amount * self.payout_multiplier
         return 0.0
 
+    def _calculate_payouts(self, player_won: np.ndarray) -> np.ndarray:
+        return np.where(player_won, self.bet_amount * self.payout_multiplier, 0.0)
+
 
 class ModifiedPayoutGame(DiceGame):
-    def __init__(self, sides: int = 6, bet_amount: float = 1.0, payout_multiplier: float = 5.7):
-        super().__init__(sides, bet_amount)
+    def __init__(
+        self, sides: int = 6, bet_amount: float = 1.0, payout_multiplier: float = 5.7, seed: SeedLike = None
+    ):
+        super().__init__(sides, bet_amount, seed)
         self.payout_multiplier = payout_multiplier
 
     def _calculate_payout(self, player_won: bool) -> float:
@@ -104,6 +185,9 @@ class ModifiedPayoutGame(DiceGame):
             return self.bet_amount * self.payout_multiplier
         return 0.0
 
+    def _calculate_payouts(self, player_won: np.ndarray) -> np.ndarray:
+        return np.where(player_won, self.bet_amount * self.payout_multiplier, 0.0)
+
 
 class NormalDistributionGame(DiceGame):
     def __init__(
@@ -114,20 +198,21 @@ class NormalDistributionGame(DiceGame):
         std_multiplier: float = 1.5,
         min_multiplier: float = 0.0,
         max_multiplier: float = 10.0,
+        seed: SeedLike = None,
     ):
-        super().__init__(sides, bet_amount)
+        super().__init__(sides, bet_amount, seed)
         self.mean_multiplier = mean_multiplier
         self.std_multiplier = std_multiplier
         self.min_multiplier = min_multiplier
         self.max_multiplier = max_multiplier
 
     def play(self) -> Dict[str, float]:
-        player_choice = np.random.randint(1, self.sides + 1)
-        dice_roll = np.random.randint(1, self.sides + 1)
+        player_choice = self.rng.integers(1, self.sides + 1)
+        dice_roll = self.rng.integers(1, self.sides + 1)
         player_won = dice_roll == player_choice
 
         if player_won:
-            multiplier = np.random.normal(self.mean_multiplier, self.std_multiplier)
+            multiplier = self.rng.normal(self.mean_multiplier, self.std_multiplier)
             multiplier = np.clip(multiplier, self.min_multiplier, self.max_multiplier)
             multiplier = max(0.0, multiplier)
             payout = self.bet_amount * multiplier
@@ -146,31 +231,100 @@ class NormalDistributionGame(DiceGame):
             "house_profit": house_profit,
         }
 
+    def play_batch(self, n: int) -> Dict[str, np.ndarray]:
+        player_choice = self.rng.integers(1, self.sides + 1, size=n)
+        dice_roll = self.rng.integers(1, self.sides + 1, size=n)
+        player_won = dice_roll == player_choice
+
+        multiplier = self.rng.normal(self.mean_multiplier, self.std_multiplier, size=int(player_won.sum()))
+        multiplier = np.clip(multiplier, self.min_multiplier, self.max_multiplier)
+        multiplier = np.maximum(0.0, multiplier)
+        payout = np.zeros(n, dtype=float)
+        payout[player_won] = self.bet_amount * multiplier
+
+        return {
+            "player_bet": np.full(n, self.bet_amount, dtype=float),
+            "dice_roll": dice_roll,
+            "player_choice": player_choice,
+            "player_won": player_won,
+            "payout": payout,
+            "player_profit": payout - self.bet_amount,
+            "house_profit": self.bet_amount - payout,
+        }
+
     def _calculate_payout(self, player_won: bool) -> float:
         return 0.0
 
 
 class Lucky9Game:
     base_deck = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9] * 4 + [0] * 16, dtype=float)
+    card_values = base_deck.astype(np.int8)
+    _total_table: Optional[np.ndarray] = None
 
-    def __init__(self, bet_amount: float = 1.0, payout_multiplier: float = 2.0):
+    def __init__(self, bet_amount: float = 1.0, payout_multiplier: float = 2.0, seed: SeedLike = None):
         self.bet_amount = bet_amount
         self.payout_multiplier = payout_multiplier
-
-    @classmethod
-    def build_deck(cls) -> np.ndarray:
-        deck = np.random.permutation(cls.base_deck)
-        return deck
+        self.rng, self.seed = make_rng(seed)
 
     @staticmethod
-    def draw_from_deck(deck: np.ndarray, count: int = 1) -> (np.ndarray, np.ndarray):
-        drawn = deck[:count]
-        remainder = deck[count:]
-        return drawn, remainder
+    def hand_total(cards: np.ndarray) -> int:
+        return int(cards.sum()) % 10
 
     @staticmethod
-    def hand_total(cards: np.ndarray) -> int:
-        return int(cards.sum() % 10)
+    def sample_positions(rng: np.random.Generator, deck_size: int, n: int, count: int) -> np.ndarray:
+        """
+        Draw `count` distinct deck positions for each of `n` hands without
+        shuffling the deck: pick the k-th free slot, then step over earlier picks.
+        """
+        if n == 1:
+            # Single hands (the /api path) are cheaper in plain Python: integers() with
+            # array bounds costs more than shuffling the whole deck, plain uniforms do not.
+            taken = []
+            hand = []
+            for j, u in enumerate(rng.random(count).tolist()):
+                pick = int(u * (deck_size - j))
+                for position in taken:
+                    pick += pick >= position
+                bisect.insort(taken, pick)
+                hand.append(pick)
+            return np.array([hand], dtype=np.int64)
+
+        picks = rng.integers(0, deck_size - np.arange(count), size=(n, count))
+        for j in range(1, count):
+            pick = picks[:, j]
+            for taken in np.sort(picks[:, :j], axis=1).T:
+                pick += pick >= taken
+        return picks
+
+    def deal(self, n: int, count: int = 4) -> np.ndarray:
+        """
+        Card values for `n` independent hands of `count` cards from a fresh deck.
+        """
+        return self.card_values[self.sample_positions(self.rng, len(self.card_values), n, count)]
+
+    @classmethod
+    def total_table(cls) -> np.ndarray:
+        """
+        10x10 joint probability of (player_total, dealer_total) for two-card
+        hands from a fresh deck, enumerated once over card values and cached.
+        """
+        if cls._total_table is None:
+            values, counts = np.unique(cls.card_values.astype(int), return_counts=True)
+            deck_size = counts.sum()
+            v1, v2, v3, v4 = (axis.ravel() for axis in np.indices((len(values),) * 4))
+
+            # Ordered draws without replacement: each card's weight is the copies left of its value.
+            probability = counts[v1] / deck_size
+            probability = probability * (counts[v2] - (v2 == v1)) / (deck_size - 1)
+            probability = probability * (counts[v3] - (v3 == v1) - (v3 == v2)) / (deck_size - 2)
+            probability = probability * (counts[v4] - (v4 == v1) - (v4 == v2) - (v4 == v3)) / (deck_size - 3)
+            probability = np.clip(probability, 0.0, None)
+
+            table = np.zeros((10, 10), dtype=float)
+            np.add.at(table, ((values[v1] + values[v2]) % 10, (values[v3] + values[v4]) % 10), probability)
+            table.flags.writeable = False
+            cls._total_table = table
+        return cls._total_table
 
     def resolve(self, player_cards: np.ndarray, dealer_cards: np.ndarray) -> Dict[str, float]:
         player_total = self.hand_total(player_cards)
@@ -202,22 +356,80 @@ class Lucky9Game:
         }
 
     def play(self) -> Dict[str, float]:
-        deck = self.build_deck()
-        player_draw, deck = self.draw_from_deck(deck, 2)
-        dealer_draw, deck = self.draw_from_deck(deck, 2)
-        return self.resolve(player_draw, dealer_draw)
+        cards = self.deal(1)[0]
+        return self.resolve(cards[:2], cards[2:])
+
+    def play_batch(self, n: int) -> Dict[str, np.ndarray]:
+        cards = self.deal(n)
+        player_cards = cards[:, :2]
+        dealer_cards = cards[:, 2:]
+        player_total = player_cards.sum(axis=1, dtype=np.int64) % 10
+        dealer_total = dealer_cards.sum(axis=1, dtype=np.int64) % 10
+        player_won = player_total > dealer_total
+        tie = player_total == dealer_total
+
+        payout = np.where(tie, self.bet_amount, np.where(player_won, self.bet_amount * self.payout_multiplier, 0.0))
+        return {
+            "player_bet": np.full(n, self.bet_amount, dtype=float),
+            "player_cards": player_cards,
+            "dealer_cards": dealer_cards,
+            "player_total": player_total,
+            "dealer_total": dealer_total,
+            "player_won": player_won,
+            "tie": tie,
+            "payout": payout,
+            "player_profit": payout - self.bet_amount,
+            "house_profit": self.bet_amount - payout,
+        }
 
 
-class SlotMachineGame:
+class AliasTable:
     """
-    Simple 3-reel slot:
-    - Weighted symbols per reel (rarer symbols pay more)
-    - Pays on triples only; no double/any-7 wins
-    Designed with a small house edge; a small forced-win chance keeps occasional wins.
+    Vose alias table: O(1) sampling from a fixed discrete distribution.
+    Each draw uses one uniform; its integer part picks a column and its
+    fractional part decides between the column and its alias.
     """
 
-    def __init__(self, bet_amount: float = 1.0):
-        self.bet_amount = bet_amount
+    def __init__(self, probabilities: np.ndarray):
+        probabilities = np.asarray(probabilities, dtype=float)
+        size = len(probabilities)
+        scaled = probabilities / probabilities.sum() * size
+        self.size = size
+        self.accept = np.ones(size, dtype=float)
+        self.alias = np.arange(size, dtype=np.int64)
+
+        small = [i for i in range(size) if scaled[i] < 1.0]
+        large = [i for i in range(size) if scaled[i] >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.accept[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        self._accept_list = self.accept.tolist()
+        self._alias_list = self.alias.tolist()
+
+    def lookup(self, uniforms: np.ndarray) -> np.ndarray:
+        scaled = uniforms * self.size
+        column = scaled.astype(np.int64)
+        return np.where(scaled - column < self.accept[column], column, self.alias[column])
+
+    def lookup_one(self, uniform: float) -> int:
+        scaled = uniform * self.size
+        column = int(scaled)
+        return column if scaled - column < self._accept_list[column] else self._alias_list[column]
+
+    def sample(self, rng: np.random.Generator, size) -> np.ndarray:
+        return self.lookup(rng.random(size))
+
+
+class SlotMachineModel:
+    """
+    Precomputed reel model shared by every SlotMachineGame: integer symbol
+    codes, an alias table over the reel weights and per-code triple multipliers.
+    """
+
+    def __init__(self):
         self.symbols = np.array(["A", "B", "C", "D", "7", "BAR"], dtype=str)
         # Distinct appearance rates (sum to 1 after normalization)
         self.weights = np.array([0.30, 0.24, 0.18, 0.12, 0.10, 0.06], dtype=float)
@@ -225,32 +437,235 @@ class SlotMachineGame:
         self.triple_multipliers = {"A": 2.0, "B": 3.0, "C": 5.0, "D": 8.0, "7": 15.0, "BAR": 25.0}
         self.force_win_chance = 0.08
 
-    def play(self) -> Dict[str, float]:
-        if np.random.rand() < self.force_win_chance:
-            symbol = np.random.choice(list(self.triple_multipliers.keys()))
-            spin = np.array([symbol, symbol, symbol])
-        else:
-            spin = np.random.choice(self.symbols, size=3, p=self.weights)
-        unique, counts = np.unique(spin, return_counts=True)
-        max_idx = counts.argmax()
-        symbol = unique[max_idx]
-        count = counts[max_idx]
+        self.reel = AliasTable(self.weights)
+        self.multipliers = np.array([self.triple_multipliers.get(symbol, 2.0) for symbol in self.symbols], dtype=float)
+        self.forced_codes = np.array(
+            [np.flatnonzero(self.symbols == symbol)[0] for symbol in self.triple_multipliers], dtype=np.int64
+        )
+        self.symbol_list = self.symbols.tolist()
+        self.multiplier_list = self.multipliers.tolist()
+        self.forced_code_list = self.forced_codes.tolist()
+
+    def spin(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """
+        Symbol codes, shape (n, 3). Uniform columns: forced-win flag, forced symbol, three reels.
+        """
+        return self.spin_from_uniforms(rng.random((n, 5)))
+
+    def spin_from_uniforms(self, uniforms: np.ndarray) -> np.ndarray:
+        """
+        Symbol codes for an (n, 5) block of uniforms laid out as in spin().
+        """
+        codes = self.reel.lookup(uniforms[:, 2:])
+        forced = uniforms[:, 0] < self.force_win_chance
+        forced_codes = self.forced_codes[(uniforms[forced, 1] * len(self.forced_codes)).astype(np.int64)]
+        codes[forced] = forced_codes[:, None]
+        return codes
+
+    def payout_multipliers(self, codes: np.ndarray) -> np.ndarray:
+        triple = (codes[:, 0] == codes[:, 1]) & (codes[:, 1] == codes[:, 2])
+        return np.where(triple, self.multipliers[codes[:, 0]], 0.0)
 
-        multiplier = 0.0
-        if count == 3:
-            multiplier = self.triple_multipliers.get(symbol, 2.0)
+    def spin_one(self, rng: np.random.Generator) -> list:
+        u_forced, u_symbol, *u_reels = rng.random(5).tolist()
+        if u_forced < self.force_win_chance:
+            return [self.forced_code_list[int(u_symbol * len(self.forced_code_list))]] * 3
+        return [self.reel.lookup_one(u) for u in u_reels]
+
+
+_slot_machine_model: Optional[SlotMachineModel] = None
+
+
+def slot_machine_model() -> SlotMachineModel:
+    global _slot_machine_model
+    if _slot_machine_model is None:
+        _slot_machine_model = SlotMachineModel()
+    return _slot_machine_model
+
+
+class SlotMachineGame:
+    """
+    Simple 3-reel slot:
+    - Weighted symbols per reel (rarer symbols pay more)
+    - Pays on triples only; no double/any-7 wins
+    Designed with a small house edge; a small forced-win chance keeps occasional wins.
+    Reels come from the module-level SlotMachineModel, built once per process.
+    """
+
+    def __init__(self, bet_amount: float = 1.0, seed: SeedLike = None):
+        self.bet_amount = bet_amount
+        self.rng, self.seed = make_rng(seed)
+        self.model = slot_machine_model()
+        self.symbols = self.model.symbols
+        self.weights = self.model.weights
+        self.triple_multipliers = self.model.triple_multipliers
+        self.force_win_chance = self.model.force_win_chance
+
+    def play(self) -> Dict[str, float]:
+        first, second, third = self.model.spin_one(self.rng)
+        multiplier = self.model.multiplier_list[first] if first == second == third else 0.0
 
         payout = self.bet_amount * multiplier
         player_profit = payout - self.bet_amount
         house_profit = self.bet_amount - payout
 
+        symbols = self.model.symbol_list
         return {
             "player_bet": self.bet_amount,
             "player_won": payout > 0,
-            "spin_result": spin.tolist(),
+            "spin_result": [symbols[first], symbols[second], symbols[third]],
+            "multiplier": multiplier,
+            "payout": payout,
+            "player_profit": player_profit,
+            "house_profit": house_profit,
+        }
+
+    def play_batch(self, n: int) -> Dict[str, np.ndarray]:
+        codes = self.model.spin(self.rng, n)
+        multiplier = self.model.payout_multipliers(codes)
+        payout = self.bet_amount * multiplier
+
+        return {
+            "player_bet": np.full(n, self.bet_amount, dtype=float),
+            "player_won": payout > 0,
+            "spin_codes": codes,
+            "multiplier": multiplier,
+            "payout": payout,
+            "player_profit": payout - self.bet_amount,
+            "house_profit": self.bet_amount - payout,
+        }
+
+
+COLORS = ("red", "blue", "green", "yellow", "pink", "white")
+
+
+class ColorDiceGame:
+    """
+    Three colour dice from the /play page: the player bets on a colour and is
+    paid per matching die. Probabilities, CDF and match multipliers are built once.
+    """
+
+    def __init__(
+        self,
+        mode: str = "fair",
+        bet_color: str = "red",
+        chosen_prob: float = 0.18,
+        bet_amount: float = 1.0,
+        seed: SeedLike = None,
+    ):
+        self.mode = mode
+        self.bet_color = bet_color
+        self.bet_code = COLORS.index(bet_color)
+        self.bet_amount = bet_amount
+        self.rng, self.seed = make_rng(seed)
+
+        if mode in ("tweaked", "weighted"):
+            chosen_p = max(0.05, min(chosen_prob, 0.3))
+            remaining = (1.0 - chosen_p) / (len(COLORS) - 1)
+            probabilities = [remaining] * len(COLORS)
+            probabilities[self.bet_code] = chosen_p
+        else:
+            probabilities = [1 / len(COLORS)] * len(COLORS)
+        if mode == "tweaked":
+            multipliers = [0.0, 0.9, 1.8, 2.7]
+        else:
+            multipliers = [0.0, 1.0, 2.0, 3.0]
+
+        self.probabilities = probabilities
+        self.cdf = np.cumsum(probabilities)
+        self.cdf[-1] = 1.0
+        self.multipliers = np.array(multipliers, dtype=float)
+        self._cdf_list = self.cdf.tolist()
+
+    def play(self) -> Dict[str, float]:
+        codes = [bisect.bisect_right(self._cdf_list, u) for u in self.rng.random(3).tolist()]
+        matches = codes.count(self.bet_code)
+        multiplier = float(self.multipliers[matches])
+        payout = self.bet_amount * multiplier
+        player_profit = payout - self.bet_amount
+        house_profit = self.bet_amount - payout
+        return {
+            "player_bet": self.bet_amount,
+            "dice": [COLORS[code] for code in codes],
+            "matches": matches,
             "multiplier": multiplier,
+            "player_won": player_profit > 0,
             "payout": payout,
             "player_profit": player_profit,
             "house_profit": house_profit,
         }
 
+    def play_batch(self, n: int) -> Dict[str, np.ndarray]:
+        codes = np.searchsorted(self.cdf, self.rng.random((n, 3)), side="right")
+        matches = (codes == self.bet_code).sum(axis=1)
+        multiplier = self.multipliers[matches]
+        payout = self.bet_amount * multiplier
+        return {
+            "player_bet": np.full(n, self.bet_amount, dtype=float),
+            "dice_codes": codes,
+            "matches": matches,
+            "multiplier": multiplier,
+            "player_won": payout > self.bet_amount,
+            "payout": payout,
+            "player_profit": payout - self.bet_amount,
+            "house_profit": self.bet_amount - payout,
+        }
+
+
+@lru_cache(maxsize=256)
+def shared_game(
+    mode: str, bet_color: Optional[str] = None, chosen_prob: Optional[float] = None, multiplier: Optional[float] = None
+):
+    """
+    LRU-bounded registry of prebuilt unit-bet games for the interactive
+    endpoints, keyed by (mode, bet_color, chosen_prob, multiplier).
+    Callers scale payouts by their bet and should not mutate the instance.
+    """
+    if mode == "lucky9":
+        game = Lucky9Game(bet_amount=1.0, payout_multiplier=multiplier)
+    elif mode == "slot":
+        game = SlotMachineGame(bet_amount=1.0)
+    else:
+        game = ColorDiceGame(mode=mode, bet_color=bet_color, chosen_prob=chosen_prob, bet_amount=1.0)
+    _shared_instances.add(game)
+    return game
+
+
+# Every shared game built in this process. A forked worker reseeds them, so
+# workers forked from a prewarmed parent do not all replay the parent's stream.
+_shared_instances: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _reseed_shared_games() -> None:
+    for game in list(_shared_instances):
+        game.rng, game.seed = make_rng(None)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_shared_games)
+
+
+def prewarm_models() -> None:
+    """
+    Build the shared tables and the default interactive games up front. Called
+    from a preloading server's parent process, the forked workers inherit them
+    instead of building them again.
+    """
+    slot_machine_model()
+    Lucky9Game.total_table()
+    for color in COLORS:
+        shared_game("fair", color)
+        for mode in ("tweaked", "weighted"):
+            shared_game(mode, color, 0.18)
+    shared_game("lucky9", None, None, 2.0)
+    shared_game("slot")
+
+
+def with_seed(game, seed: SeedLike):
+    """
+    Shallow copy of `game` drawing from its own seeded stream; the precomputed
+    tables stay shared with the original.
+    """
+    seeded = copy.copy(game)
+    seeded.rng, seeded.seed = make_rng(seed)
+    return seeded
@@ -0,0 +1,148 @@
+"""
+Background queue for long /simulate runs: submit, poll progress, cancel.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+class SimulationJob:
+    """
+    One submitted run. `progress` maps each game label to the rounds finished so
+    far; `result` holds whatever the job function returned once it is done.
+    """
+
+    def __init__(self, job_id: str, labels, total_per_game: int):
+        self.id = job_id
+        self.status = "queued"
+        self.total_per_game = total_per_game
+        self.progress: Dict[str, int] = {label: 0 for label in labels}
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def advance(self, label: str, rounds: int) -> None:
+        """
+        Progress callback for run_games; raises JobCancelled once cancel() was called.
+        """
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.id)
+        with self._lock:
+            self.progress[label] = self.progress.get(label, 0) + rounds
+
+    def complete(self) -> None:
+        """
+        Mark every game as fully played. Cache hits and precision-targeted runs
+        that stop early finish without reporting every round.
+        """
+        with self._lock:
+            for label in self.progress:
+                self.progress[label] = self.total_per_game
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("finished", "failed", "cancelled")
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            progress = dict(self.progress)
+        total = self.total_per_game * len(progress)
+        completed = sum(progress.values())
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": progress,
+            "rounds_per_game": self.total_per_game,
+            "fraction_done": completed / total if total else 1.0,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    Bounded thread pool for simulation jobs. At most `max_pending` jobs may be
+    queued or running at once; further submissions raise QueueFull so the caller
+    can push back. Finished jobs are kept for `ttl` seconds for polling.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 8, ttl: float = 3600.0):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulation-job")
+        self._jobs: "OrderedDict[str, SimulationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        for job_id in [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at + self.ttl <= now
+        ]:
+            del self._jobs[job_id]
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.done)
+
+    def submit(self, labels, total_per_game: int, func: Callable[[SimulationJob], object]) -> SimulationJob:
+        """
+        Queue `func(job)`; it should pass `job.advance` to run_games as the progress callback.
+        """
+        job = SimulationJob(secrets.token_urlsafe(8), labels, total_per_game)
+        with self._lock:
+            self._expire(time.time())
+            if sum(1 for queued in self._jobs.values() if not queued.done) >= self.max_pending:
+                raise QueueFull(f"{self.max_pending} simulation jobs already pending")
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, func)
+        return job
+
+    def _run(self, job: SimulationJob, func: Callable[[SimulationJob], object]) -> None:
+        if job.cancel_event.is_set():
+            job.status = "cancelled"
+        else:
+            job.status = "running"
+            try:
+                job.result = func(job)
+                job.complete()
+                job.status = "finished"
+            except JobCancelled:
+                job.status = "cancelled"
+            except Exception as exc:
+                job.error = f"{type(exc).__name__}: {exc}"
+                job.status = "failed"
+        job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        with self._lock:
+            self._expire(time.time())
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[SimulationJob]:
+        job = self.get(job_id)
+        if job is not None and not job.done:
+            job.cancel_event.set()
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_event.set()
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,162 @@
+"""
+Opt-in timers and counters for the app and the simulation engine, rendered in
+the Prometheus text format, plus per-request cProfile capture.
+"""
+
+import io
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import cProfile
+
+PREFIX = "cardandslot"
+
+_HELP = {
+    "stage_seconds": ("summary", "Time spent in each /simulate pipeline stage."),
+    "simulation_rounds_total": ("counter", "Rounds simulated per game."),
+    "simulation_seconds_total": ("counter", "Seconds spent simulating per game, summed over chunks."),
+    "simulation_rounds_per_second": ("gauge", "Rounds per second per game since startup (per worker under a pool)."),
+    "http_requests_total": ("counter", "Requests handled per endpoint, method and status."),
+    "http_request_seconds": ("summary", "Request latency per endpoint."),
+}
+
+
+def _labels(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class Metrics:
+    """
+    Process-wide counters and timers keyed by name and labels. Disabled by
+    default; while disabled every recording call returns straight away.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._counters: Dict[tuple, float] = {}
+        # (name, labels) -> [count, total seconds]
+        self._timers: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            timer = self._timers.setdefault(key, [0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time the block (or, used as a decorator, each call) as pipeline stage `name`.
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - started, stage=name)
+
+    def record_rounds(self, game: str, rounds: int, seconds: float) -> None:
+        if not self.enabled:
+            return
+        self.count("simulation_rounds_total", rounds, game=game)
+        self.count("simulation_seconds_total", seconds, game=game)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def render(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Prometheus text exposition of everything recorded so far. `gauges` maps
+        extra metric names to (help text, current value).
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {key: list(value) for key, value in self._timers.items()}
+
+        # Derived from the two simulation counters, so it is exact over the process lifetime.
+        for (name, labels), rounds in list(counters.items()):
+            if name == "simulation_rounds_total":
+                seconds = counters.get(("simulation_seconds_total", labels), 0.0)
+                counters[("simulation_rounds_per_second", labels)] = rounds / seconds if seconds > 0 else 0.0
+
+        lines = []
+        series: Dict[str, list] = {}
+        for (name, labels), value in counters.items():
+            series.setdefault(name, []).append(f"{PREFIX}_{name}{_format_labels(labels)} {value:.10g}")
+        for (name, labels), (calls, total) in timers.items():
+            series.setdefault(name, []).extend(
+                [
+                    f"{PREFIX}_{name}_count{_format_labels(labels)} {calls}",
+                    f"{PREFIX}_{name}_sum{_format_labels(labels)} {total:.10g}",
+                ]
+            )
+        for name in sorted(series):
+            kind, text = _HELP.get(name, ("untyped", name))
+            lines += [f"# HELP {PREFIX}_{name} {text}", f"# TYPE {PREFIX}_{name} {kind}", *sorted(series[name])]
+        for name, (text, value) in sorted((gauges or {}).items()):
+            lines += [f"# HELP {PREFIX}_{name} {text}", f"# TYPE {PREFIX}_{name} gauge"]
+            lines.append(f"{PREFIX}_{name} {value:.10g}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class RequestProfiler:
+    """
+    cProfile capture for single requests. Only one profile runs at a time, so a
+    request that asks while another is being profiled is served unprofiled.
+    """
+
+    def __init__(self, limit: int = 40, sort: str = "cumulative"):
+        self.limit = limit
+        self.sort = sort
+        self._busy = threading.Lock()
+
+    def start(self) -> Optional["cProfile.Profile"]:
+        # Imported here so the app does not load the profiler until a request asks for it.
+        import cProfile
+
+        if not self._busy.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def stop(self, profile: "cProfile.Profile") -> str:
+        import pstats
+
+        try:
+            profile.disable()
+        finally:
+            self._busy.release()
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats(self.sort).print_stats(self.limit)
+        return out.getvalue()
@@ -0,0 +1,171 @@
+"""
+On-disk store of full /simulate runs: memory-mapped .npy files of each game's
+player profit and win flag, and a JSON manifest of the run's parameters, bet
+and seed. The other result columns follow from those and are derived on read.
+"""
+
+import json
+import os
+import re
+import secrets
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from simulation import SimulationResult
+
+_RUN_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+# Columns written per game; the bet is constant within a run, so the rest are derived from these.
+STORED_COLUMNS = ("player_profit", "player_won")
+
+
+def _slug(label: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
+
+
+class StoredResult(SimulationResult):
+    """
+    A stored game's rounds: profit and win flag are memory maps, the bet is the
+    run's constant bet, and payout and house profit are computed on access.
+    chunks() derives them per chunk, so a long run is never expanded whole.
+    """
+
+    def __init__(self, player_profit: np.ndarray, player_won: np.ndarray, bet_amount: float):
+        self.player_profit = player_profit
+        self.player_won = player_won
+        self.bet_amount = bet_amount
+        self.seed: Optional[int] = None
+        self._cumulative_player_profit = None
+        self._cumulative_house_profit = None
+
+    @property
+    def player_bet(self) -> np.ndarray:
+        return np.full(len(self), self.bet_amount)
+
+    @property
+    def payout(self) -> np.ndarray:
+        return self.player_profit + self.bet_amount
+
+    @property
+    def house_profit(self) -> np.ndarray:
+        # 0.0 - x rather than -x, so pushes come back as 0.0 like bet - payout, not -0.0.
+        return 0.0 - self.player_profit
+
+    @property
+    def nbytes(self) -> int:
+        # Both stored columns, plus the cumulative columns once a chart builds them.
+        return 3 * self.player_profit.nbytes + self.player_won.nbytes
+
+    def chunks(self, chunk_size: int):
+        for start in range(0, len(self), chunk_size):
+            player_profit = np.asarray(self.player_profit[start : start + chunk_size])
+            yield SimulationResult(
+                np.full(len(player_profit), self.bet_amount),
+                player_profit + self.bet_amount,
+                player_profit,
+                0.0 - player_profit,
+                self.player_won[start : start + chunk_size],
+            )
+
+
+class RunStore:
+    """
+    Runs live under `directory/<run_id>/`. A run is written to a temporary
+    directory and renamed into place, so a half-written run is never listed.
+    Reloaded columns are read-only memory maps: only the pages a summary or
+    chart touches are read from disk.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, run_id: str) -> Path:
+        if not _RUN_ID.match(run_id or ""):
+            raise KeyError(run_id)
+        return self.directory / run_id
+
+    def save(
+        self,
+        results: Dict[str, SimulationResult],
+        num_simulations: int,
+        bet_amount: float,
+        seed: int,
+        params: dict,
+    ) -> str:
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}"
+        staging = self.directory / f".tmp-{run_id}"
+        staging.mkdir()
+        try:
+            games = {}
+            for label, result in results.items():
+                if not np.all(result.player_bet == bet_amount):
+                    raise ValueError(f"{label} has bets other than {bet_amount}; only flat-bet runs can be stored")
+                slug = _slug(label)
+                (staging / slug).mkdir()
+                for column in STORED_COLUMNS:
+                    np.save(staging / slug / f"{column}.npy", getattr(result, column))
+                games[label] = {"directory": slug, "rounds": len(result)}
+            manifest = {
+                "run_id": run_id,
+                "created_at": time.time(),
+                "num_simulations": num_simulations,
+                "bet_amount": bet_amount,
+                "seed": seed,
+                "params": params,
+                "columns": list(STORED_COLUMNS),
+                "games": games,
+                "bytes": sum(path.stat().st_size for path in staging.rglob("*.npy")),
+            }
+            with open(staging / "manifest.json", "w") as fh:
+                json.dump(manifest, fh, indent=2)
+            os.replace(staging, self.directory / run_id)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return run_id
+
+    def manifest(self, run_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(run_id) / "manifest.json") as fh:
+                return json.load(fh)
+        except (KeyError, OSError, ValueError):
+            return None
+
+    def list(self) -> List[Dict]:
+        manifests = [self.manifest(path.name) for path in self.directory.iterdir() if not path.name.startswith(".")]
+        return sorted(filter(None, manifests), key=lambda manifest: manifest["created_at"], reverse=True)
+
+    def load(self, run_id: str) -> Optional[Dict[str, SimulationResult]]:
+        """
+        The run's results keyed by game label, backed by read-only memory maps.
+        """
+        manifest = self.manifest(run_id)
+        if manifest is None:
+            return None
+        results = {}
+        for label, entry in manifest["games"].items():
+            folder = self._path(run_id) / entry["directory"]
+            # Runs saved before the compact layout have every column on disk.
+            columns = manifest.get("columns", SimulationResult.columns)
+            arrays = {column: np.load(folder / f"{column}.npy", mmap_mode="r") for column in columns}
+            if tuple(columns) == STORED_COLUMNS:
+                result = StoredResult(arrays["player_profit"], arrays["player_won"], manifest["bet_amount"])
+            else:
+                result = SimulationResult(*(arrays[column] for column in SimulationResult.columns))
+            result.seed = manifest["seed"]
+            results[label] = result
+        return results
+
+    def delete(self, run_id: str) -> bool:
+        try:
+            path = self._path(run_id)
+        except KeyError:
+            return False
+        if not (path / "manifest.json").exists():
+            return False
+        shutil.rmtree(path)
+        return True
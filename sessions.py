@@ -0,0 +1,107 @@
+"""
+Server-side store for open interactive Lucky 9 hands.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from games import Lucky9Game
+
+
+class Lucky9Hand:
+    """
+    One open hand: the five cards it can ever use (two player cards, an
+    optional third, two dealer cards) are dealt up front as int8 values.
+    """
+
+    __slots__ = ("shoe", "player_count", "bet_amount", "payout_multiplier", "last_used")
+
+    def __init__(self, shoe: np.ndarray, bet_amount: float, payout_multiplier: float):
+        self.shoe = shoe
+        self.player_count = 2
+        self.bet_amount = bet_amount
+        self.payout_multiplier = payout_multiplier
+        self.last_used = time.monotonic()
+
+    @property
+    def player_cards(self) -> np.ndarray:
+        return self.shoe[: self.player_count]
+
+    @property
+    def dealer_cards(self) -> np.ndarray:
+        return self.shoe[self.player_count : self.player_count + 2]
+
+    def draw(self) -> np.ndarray:
+        if self.player_count >= 3:
+            raise ValueError("player already drew a third card")
+        drawn = self.shoe[self.player_count : self.player_count + 1]
+        self.player_count += 1
+        return drawn
+
+
+class HandStore:
+    """
+    Open hands keyed by a short random ID, kept in least-recently-used order.
+    Idle hands expire after `ttl` seconds and the oldest hands are dropped once
+    more than `max_hands` are open.
+    """
+
+    def __init__(self, max_hands: int = 10000, ttl: float = 900.0):
+        self.max_hands = max_hands
+        self.ttl = ttl
+        self._hands: "OrderedDict[str, Lucky9Hand]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._hands:
+            hand_id, hand = next(iter(self._hands.items()))
+            if hand.last_used + self.ttl > now and len(self._hands) <= self.max_hands:
+                break
+            del self._hands[hand_id]
+
+    def open(self, game: Lucky9Game, bet_amount: float, payout_multiplier: float) -> (str, Lucky9Hand):
+        hand = Lucky9Hand(game.deal(1, 5)[0], bet_amount, payout_multiplier)
+        hand_id = secrets.token_urlsafe(6)
+        with self._lock:
+            self._hands[hand_id] = hand
+            self._expire(hand.last_used)
+        return hand_id, hand
+
+    def get(self, hand_id: str) -> Optional[Lucky9Hand]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            hand = self._hands.get(hand_id)
+            if hand is not None:
+                hand.last_used = now
+                self._hands.move_to_end(hand_id)
+            return hand
+
+    def draw(self, hand_id: str) -> (Optional[Lucky9Hand], Optional[np.ndarray]):
+        """
+        Deal the player's third card under the store lock; (None, None) for an unknown hand.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            hand = self._hands.get(hand_id)
+            if hand is None:
+                return None, None
+            drawn = hand.draw()
+            hand.last_used = now
+            self._hands.move_to_end(hand_id)
+            return hand, drawn
+
+    def close(self, hand_id: str) -> Optional[Lucky9Hand]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return self._hands.pop(hand_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hands)
@@ -2,9 +2,16 @@
 Monte Carlo simulation helpers for the Flask project.
 """
 
-import pandas as pd
-from typing import Dict
+import math
+import statistics
+import time
+from concurrent.futures import as_completed
 
+import numpy as np
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Union
+
+from bankroll import BankrollResult, run_bankroll
+from metrics import METRICS
 from games import (
     FairDiceGame,
     TweakedDiceGame,
@@ -13,80 +20,682 @@ from games import (
     NormalDistributionGame,
     Lucky9Game,
     SlotMachineGame,
+    new_seed,
+)
+
+if TYPE_CHECKING:
+    # pandas costs a few hundred ms to import; only to_frame() needs it, so it is imported there.
+    import pandas as pd
+
+# Called as progress(label, rounds) after each finished chunk; raising from it aborts the run.
+ProgressCallback = Callable[[str, int], None]
+
+GAME_LABELS = (
+    "Fair Game",
+    "Reduced Payout",
+    "Weighted Probabilities",
+    "Modified Payout",
+    "Normal Distribution",
+    "Lucky 9",
+    "Slot Machine",
 )
 
 
-def run_simulation(game, num_simulations: int = 10000) -> pd.DataFrame:
-    results = []
-    for _ in range(num_simulations):
-        results.append(game.play())
-    df = pd.DataFrame(results)
-    df["cumulative_player_profit"] = df["player_profit"].cumsum()
-    df["cumulative_house_profit"] = df["house_profit"].cumsum()
-    df["game_number"] = range(1, len(df) + 1)
-    return df
+class SimulationResult:
+    """
+    Struct-of-arrays container for one game's simulated rounds.
+    Cumulative columns are derived on first access; a DataFrame is only
+    built by to_frame().
+    """
+
+    columns = ("player_bet", "payout", "player_profit", "house_profit", "player_won")
+
+    def __init__(
+        self,
+        player_bet: np.ndarray,
+        payout: np.ndarray,
+        player_profit: np.ndarray,
+        house_profit: np.ndarray,
+        player_won: np.ndarray,
+    ):
+        self.player_bet = np.asarray(player_bet, dtype=float)
+        self.payout = np.asarray(payout, dtype=float)
+        self.player_profit = np.asarray(player_profit, dtype=float)
+        self.house_profit = np.asarray(house_profit, dtype=float)
+        self.player_won = np.asarray(player_won, dtype=bool)
+        self.seed: Optional[int] = None
+        self._cumulative_player_profit = None
+        self._cumulative_house_profit = None
+
+    @classmethod
+    def from_batch(cls, batch: Dict[str, np.ndarray]) -> "SimulationResult":
+        return cls(*(batch[column] for column in cls.columns))
+
+    @classmethod
+    def from_rows(cls, rows) -> "SimulationResult":
+        rows = list(rows)
+        return cls(*(np.array([row[column] for row in rows]) for column in cls.columns))
+
+    @classmethod
+    def concatenate(cls, chunks) -> "SimulationResult":
+        chunks = list(chunks)
+        return cls(*(np.concatenate([getattr(chunk, column) for chunk in chunks]) for column in cls.columns))
+
+    def __len__(self) -> int:
+        return len(self.player_profit)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held once both cumulative columns have been built, as rendering a run does.
+        """
+        return sum(getattr(self, column).nbytes for column in self.columns) + 2 * self.player_profit.nbytes
+
+    def chunks(self, chunk_size: int):
+        """
+        Consecutive slices of at most `chunk_size` rounds; the columns are views, so
+        a memory-mapped result is only paged in one chunk at a time.
+        """
+        for start in range(0, len(self), chunk_size):
+            yield SimulationResult(*(getattr(self, column)[start : start + chunk_size] for column in self.columns))
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column not in self.columns and column not in (
+            "cumulative_player_profit",
+            "cumulative_house_profit",
+            "game_number",
+        ):
+            raise KeyError(column)
+        return getattr(self, column)
+
+    @property
+    def cumulative_player_profit(self) -> np.ndarray:
+        if self._cumulative_player_profit is None:
+            self._cumulative_player_profit = np.cumsum(self.player_profit)
+        return self._cumulative_player_profit
+
+    @property
+    def cumulative_house_profit(self) -> np.ndarray:
+        if self._cumulative_house_profit is None:
+            self._cumulative_house_profit = np.cumsum(self.house_profit)
+        return self._cumulative_house_profit
+
+    def __getstate__(self):
+        # Cumulative columns are cheap to rebuild, so they are not pickled into caches or across processes.
+        state = dict(self.__dict__)
+        state["_cumulative_player_profit"] = state["_cumulative_house_profit"] = None
+        return state
+
+    @property
+    def game_number(self) -> np.ndarray:
+        return np.arange(1, len(self) + 1)
+
+    def to_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        df = pd.DataFrame({column: getattr(self, column) for column in self.columns})
+        df["cumulative_player_profit"] = self.cumulative_player_profit
+        df["cumulative_house_profit"] = self.cumulative_house_profit
+        df["game_number"] = self.game_number
+        return df
+
+
+PROFIT_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
 
 
-def run_games(num_simulations: int, bet_amount: float, params: dict) -> Dict[str, pd.DataFrame]:
-    out: Dict[str, pd.DataFrame] = {}
+def balance_extremes(player_profit: np.ndarray) -> (float, float, float, float, float):
+    """
+    Final, highest and lowest cumulative player balance, the player's max
+    drawdown and max run-up (the house's drawdown), from one cumulative sum.
+    Balances start at 0; the cumulative series is a temporary and is not kept.
+    """
+    cumulative = np.cumsum(player_profit)
+    running = np.maximum.accumulate(cumulative)
+    highest = running[-1]
+    np.maximum(running, 0.0, out=running)
+    np.subtract(running, cumulative, out=running)
+    drawdown = running.max()
+    np.minimum.accumulate(cumulative, out=running)
+    lowest = running[-1]
+    np.minimum(running, 0.0, out=running)
+    np.subtract(cumulative, running, out=running)
+    runup = running.max()
+    return float(cumulative[-1]), float(highest), float(lowest), float(drawdown), float(runup)
 
-    if params.get("fair"):
-        out["Fair Game"] = run_simulation(FairDiceGame(bet_amount=bet_amount), num_simulations)
-    if params.get("tweaked"):
-        out["Reduced Payout"] = run_simulation(
-            TweakedDiceGame(bet_amount=bet_amount, payout_multiplier=params.get("tweaked_payout", 5.0)),
-            num_simulations,
+
+def profit_percentiles(values: np.ndarray, percentiles=PROFIT_PERCENTILES) -> list:
+    """
+    np.percentile (linear interpolation) without the partial sort when the
+    rounds only take a handful of distinct values, as every game but the
+    normal-distribution one does: order statistics are read off exact counts.
+    """
+    count = len(values)
+    candidates = np.unique(values[:: max(1, count // 4096)])
+    if len(candidates) <= 16:
+        counts = np.array([np.count_nonzero(values == candidate) for candidate in candidates])
+        if counts.sum() == count:
+            ends = np.cumsum(counts)
+            ranks = (count - 1) * np.asarray(percentiles, dtype=float) / 100
+            lower = candidates[np.searchsorted(ends, np.floor(ranks), side="right")]
+            upper = candidates[np.searchsorted(ends, np.ceil(ranks), side="right")]
+            return (lower + (ranks - np.floor(ranks)) * (upper - lower)).tolist()
+    return np.percentile(values, percentiles).tolist()
+
+
+def summary_statistics(player_bet: np.ndarray, player_profit: np.ndarray, player_won: np.ndarray) -> Dict[str, float]:
+    """
+    Every summary statistic from the per-round arrays in a handful of NumPy passes.
+    House profit is always -player_profit, so the house figures are derived
+    from the player's instead of being reduced again.
+    """
+    count = len(player_profit)
+    total_bet = float(player_bet.sum())
+    wins = int(np.count_nonzero(player_won))
+    total_player_profit = float(player_profit.sum())
+    deviation = player_profit - total_player_profit / count
+    std = math.sqrt(float(np.dot(deviation, deviation)) / (count - 1)) if count > 1 else np.nan
+    del deviation
+    final, highest, lowest, drawdown, runup = balance_extremes(player_profit)
+
+    stats = {
+        "total_games": count,
+        "total_bet": total_bet,
+        "wins": wins,
+        "losses": count - wins,
+        "win_rate": wins / count,
+        "total_player_profit": total_player_profit,
+        "total_house_profit": -total_player_profit,
+        "avg_player_profit_per_game": total_player_profit / count,
+        "avg_house_profit_per_game": -total_player_profit / count,
+        "final_player_balance": final,
+        "final_house_balance": -final,
+        "max_player_profit": highest,
+        "min_player_profit": lowest,
+        "max_house_profit": -lowest,
+        "min_house_profit": -highest,
+        "std_player_profit": std,
+        "std_house_profit": std,
+        "player_roi": total_player_profit / total_bet * 100,
+        "house_roi": -total_player_profit / total_bet * 100,
+        "max_player_drawdown": drawdown,
+        "max_house_drawdown": runup,
+    }
+    for percentile, value in zip(PROFIT_PERCENTILES, profit_percentiles(player_profit)):
+        stats[f"player_profit_p{percentile}"] = value
+    return stats
+
+
+class OnlineStatistics:
+    """
+    Running summary of simulated rounds, updated one chunk at a time.
+    Means and variances use Welford/Chan updates so memory stays constant;
+    as_dict() returns the same keys as calculate_statistics. Per-round profit
+    percentiles would need every round, so they are NaN here.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_bet = 0.0
+        self.wins = 0
+        self.mean_player_profit = 0.0
+        self.m2_player_profit = 0.0
+        self.mean_house_profit = 0.0
+        self.m2_house_profit = 0.0
+        self.final_player_balance = 0.0
+        self.final_house_balance = 0.0
+        self.max_player_profit = -np.inf
+        self.min_player_profit = np.inf
+        self.max_house_profit = -np.inf
+        self.min_house_profit = np.inf
+        self.max_player_drawdown = 0.0
+        self.max_house_drawdown = 0.0
+
+    @classmethod
+    def from_chunk(cls, chunk: SimulationResult) -> "OnlineStatistics":
+        online = cls()
+        if len(chunk) == 0:
+            return online
+        online.count = len(chunk)
+        online.total_bet = chunk.player_bet.sum()
+        online.wins = int(chunk.player_won.sum())
+        online.mean_player_profit = chunk.player_profit.mean()
+        online.m2_player_profit = ((chunk.player_profit - online.mean_player_profit) ** 2).sum()
+        online.mean_house_profit = chunk.house_profit.mean()
+        online.m2_house_profit = ((chunk.house_profit - online.mean_house_profit) ** 2).sum()
+
+        final, highest, lowest, drawdown, runup = balance_extremes(chunk.player_profit)
+        online.max_player_profit = highest
+        online.min_player_profit = lowest
+        online.max_house_profit = -lowest
+        online.min_house_profit = -highest
+        online.final_player_balance = final
+        online.final_house_balance = -final
+        online.max_player_drawdown = drawdown
+        online.max_house_drawdown = runup
+        return online
+
+    @staticmethod
+    def _merge_moments(count, mean, m2, other_count, other_mean, other_m2):
+        total = count + other_count
+        delta = other_mean - mean
+        mean = mean + delta * other_count / total
+        m2 = m2 + other_m2 + delta * delta * count * other_count / total
+        return mean, m2
+
+    def merge(self, other: "OnlineStatistics") -> None:
+        """
+        Append `other`, which must cover the rounds played right after this one.
+        Its cumulative extremes are shifted by this run's final balance.
+        """
+        if other.count == 0:
+            return
+        self.mean_player_profit, self.m2_player_profit = self._merge_moments(
+            self.count, self.mean_player_profit, self.m2_player_profit,
+            other.count, other.mean_player_profit, other.m2_player_profit,
+        )
+        self.mean_house_profit, self.m2_house_profit = self._merge_moments(
+            self.count, self.mean_house_profit, self.m2_house_profit,
+            other.count, other.mean_house_profit, other.m2_house_profit,
+        )
+        self.count += other.count
+        self.total_bet += other.total_bet
+        self.wins += other.wins
+
+        # A drawdown may start before `other` and bottom out inside it; balances start at 0.
+        self.max_player_drawdown = max(
+            self.max_player_drawdown,
+            other.max_player_drawdown,
+            max(self.max_player_profit, 0.0) - (self.final_player_balance + other.min_player_profit),
         )
-    if params.get("weighted"):
-        out["Weighted Probabilities"] = run_simulation(
-            WeightedProbabilitiesGame(bet_amount=bet_amount, player_number_weight=params.get("weighted_prob", 0.12)),
-            num_simulations,
+        self.max_house_drawdown = max(
+            self.max_house_drawdown,
+            other.max_house_drawdown,
+            max(self.max_house_profit, 0.0) - (self.final_house_balance + other.min_house_profit),
+        )
+
+        self.max_player_profit = max(self.max_player_profit, self.final_player_balance + other.max_player_profit)
+        self.min_player_profit = min(self.min_player_profit, self.final_player_balance + other.min_player_profit)
+        self.max_house_profit = max(self.max_house_profit, self.final_house_balance + other.max_house_profit)
+        self.min_house_profit = min(self.min_house_profit, self.final_house_balance + other.min_house_profit)
+        self.final_player_balance += other.final_player_balance
+        self.final_house_balance += other.final_house_balance
+
+    def update(self, chunk: SimulationResult) -> None:
+        self.merge(self.from_chunk(chunk))
+
+    def as_dict(self) -> Dict[str, float]:
+        total_player_profit = self.mean_player_profit * self.count
+        total_house_profit = self.mean_house_profit * self.count
+        stats = {
+            "total_games": self.count,
+            "total_bet": self.total_bet,
+            "wins": self.wins,
+            "losses": self.count - self.wins,
+            "win_rate": self.wins / self.count,
+            "total_player_profit": total_player_profit,
+            "total_house_profit": total_house_profit,
+            "avg_player_profit_per_game": self.mean_player_profit,
+            "avg_house_profit_per_game": self.mean_house_profit,
+            "final_player_balance": self.final_player_balance,
+            "final_house_balance": self.final_house_balance,
+            "max_player_profit": self.max_player_profit,
+            "min_player_profit": self.min_player_profit,
+            "max_house_profit": self.max_house_profit,
+            "min_house_profit": self.min_house_profit,
+        }
+        stats["std_player_profit"] = np.sqrt(self.m2_player_profit / (self.count - 1)) if self.count > 1 else np.nan
+        stats["std_house_profit"] = np.sqrt(self.m2_house_profit / (self.count - 1)) if self.count > 1 else np.nan
+        stats["player_roi"] = (stats["total_player_profit"] / stats["total_bet"]) * 100
+        stats["house_roi"] = (stats["total_house_profit"] / stats["total_bet"]) * 100
+        stats["max_player_drawdown"] = self.max_player_drawdown
+        stats["max_house_drawdown"] = self.max_house_drawdown
+        for percentile in PROFIT_PERCENTILES:
+            stats[f"player_profit_p{percentile}"] = np.nan
+        return stats
+
+
+def run_simulation(game, num_simulations: int = 10000) -> SimulationResult:
+    if hasattr(game, "play_batch"):
+        return SimulationResult.from_batch(game.play_batch(num_simulations))
+    return SimulationResult.from_rows(game.play() for _ in range(num_simulations))
+
+
+def iter_simulation_chunks(game, num_simulations: int, chunk_size: int = 100_000, label: str = ""):
+    for start in range(0, num_simulations, chunk_size):
+        started = time.perf_counter()
+        chunk = run_simulation(game, min(chunk_size, num_simulations - start))
+        METRICS.record_rounds(label or type(game).__name__, len(chunk), time.perf_counter() - started)
+        yield chunk
+
+
+def run_simulation_chunked(
+    game, num_simulations: int, chunk_size: int = 100_000, label: str = "", progress: Optional[ProgressCallback] = None
+) -> SimulationResult:
+    chunks = []
+    for chunk in iter_simulation_chunks(game, num_simulations, chunk_size, label):
+        chunks.append(chunk)
+        if progress:
+            progress(label, len(chunk))
+    return SimulationResult.concatenate(chunks)
+
+
+def run_simulation_streaming(
+    game, num_simulations: int, chunk_size: int = 100_000, label: str = "", progress: Optional[ProgressCallback] = None
+) -> Dict[str, float]:
+    online = OnlineStatistics()
+    for chunk in iter_simulation_chunks(game, num_simulations, chunk_size, label):
+        online.update(chunk)
+        if progress:
+            progress(label, len(chunk))
+    return online.as_dict()
+
+
+def roi_interval(online: OnlineStatistics, confidence: float = 0.95) -> (float, float):
+    """
+    House ROI (%) and the half-width of its normal-approximation confidence interval.
+    """
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    mean_bet = online.total_bet / online.count
+    roi = online.mean_house_profit / mean_bet * 100
+    std = math.sqrt(online.m2_house_profit / (online.count - 1)) if online.count > 1 else math.inf
+    return roi, z * std / math.sqrt(online.count) / mean_bet * 100
+
+
+def run_simulation_adaptive(
+    game,
+    target_half_width: float,
+    confidence: float = 0.95,
+    max_rounds: int = 10_000_000,
+    min_rounds: int = 10_000,
+    chunk_size: int = 100_000,
+    label: str = "",
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, float]:
+    """
+    Play until the house-ROI confidence interval is within +/- `target_half_width`
+    percentage points, or `max_rounds` is reached.
+
+    After `min_rounds`, each batch is sized from the running variance to the
+    rounds still needed, but never more than the rounds played so far, so a
+    noisy early estimate cannot overshoot by much.
+    """
+    online = OnlineStatistics()
+    batch = min(min_rounds, max_rounds)
+    while True:
+        for chunk in iter_simulation_chunks(game, batch, chunk_size, label):
+            online.update(chunk)
+            if progress:
+                progress(label, len(chunk))
+        roi, half_width = roi_interval(online, confidence)
+        if half_width <= target_half_width or online.count >= max_rounds:
+            break
+        needed = math.ceil(online.count * (half_width / target_half_width) ** 2) - online.count
+        batch = min(max(needed, chunk_size), online.count, max_rounds - online.count)
+
+    stats = online.as_dict()
+    stats.update(
+        rounds_used=online.count,
+        house_roi_ci_low=roi - half_width,
+        house_roi_ci_high=roi + half_width,
+        house_roi_half_width=half_width,
+        target_half_width=target_half_width,
+        confidence=confidence,
+        converged=half_width <= target_half_width,
+    )
+    return stats
+
+
+def game_seed_sequences(seed: Optional[int]) -> Dict[str, np.random.SeedSequence]:
+    # One child per game in a fixed order, so a game's stream does not depend on which others are selected.
+    return dict(zip(GAME_LABELS, np.random.SeedSequence(seed).spawn(len(GAME_LABELS))))
+
+
+# /simulate flag that selects each game. "modified_payout" doubles as that game's multiplier.
+GAME_FLAGS = {
+    "Fair Game": "fair",
+    "Reduced Payout": "tweaked",
+    "Weighted Probabilities": "weighted",
+    "Modified Payout": "modified_payout",
+    "Normal Distribution": "normal_dist",
+    "Lucky 9": "lucky9",
+    "Slot Machine": "slot_machine",
+}
+
+
+def build_game(label: str, bet_amount: float, params: dict, seed: Optional[int] = None):
+    """
+    The game `label` configured from `params`, whether or not its flag is set.
+    It draws the same stream as build_games(bet_amount, params, seed)[label].
+    """
+    seed_sequence = game_seed_sequences(seed)[label]
+    if label == "Fair Game":
+        return FairDiceGame(bet_amount=bet_amount, seed=seed_sequence)
+    if label == "Reduced Payout":
+        return TweakedDiceGame(
+            bet_amount=bet_amount, payout_multiplier=params.get("tweaked_payout", 5.0), seed=seed_sequence
         )
-    if params.get("modified_payout"):
-        out["Modified Payout"] = run_simulation(
-            ModifiedPayoutGame(bet_amount=bet_amount, payout_multiplier=params.get("modified_payout", 5.7)),
-            num_simulations,
+    if label == "Weighted Probabilities":
+        return WeightedProbabilitiesGame(
+            bet_amount=bet_amount, player_number_weight=params.get("weighted_prob", 0.12), seed=seed_sequence
         )
-    if params.get("normal_dist"):
-        out["Normal Distribution"] = run_simulation(
-            NormalDistributionGame(
-                bet_amount=bet_amount,
-                mean_multiplier=params.get("normal_mean", 5.0),
-                std_multiplier=params.get("normal_std", 1.5),
-            ),
-            num_simulations,
+    if label == "Modified Payout":
+        multiplier = params.get("modified_payout", 5.7)
+        # A bare True only selects the game, at the default multiplier.
+        if isinstance(multiplier, bool):
+            multiplier = 5.7
+        return ModifiedPayoutGame(bet_amount=bet_amount, payout_multiplier=multiplier, seed=seed_sequence)
+    if label == "Normal Distribution":
+        return NormalDistributionGame(
+            bet_amount=bet_amount,
+            mean_multiplier=params.get("normal_mean", 5.0),
+            std_multiplier=params.get("normal_std", 1.5),
+            seed=seed_sequence,
         )
-    if params.get("lucky9"):
-        out["Lucky 9"] = run_simulation(
-            Lucky9Game(bet_amount=bet_amount, payout_multiplier=params.get("lucky9_payout", 2.0)),
-            num_simulations,
+    if label == "Lucky 9":
+        return Lucky9Game(
+            bet_amount=bet_amount, payout_multiplier=params.get("lucky9_payout", 2.0), seed=seed_sequence
         )
-    if params.get("slot_machine"):
-        out["Slot Machine"] = run_simulation(SlotMachineGame(bet_amount=bet_amount), num_simulations)
+    if label == "Slot Machine":
+        return SlotMachineGame(bet_amount=bet_amount, seed=seed_sequence)
+    raise ValueError(f"unknown game {label!r}; expected one of {', '.join(GAME_LABELS)}")
+
+
+def build_games(bet_amount: float, params: dict, seed: Optional[int] = None) -> Dict[str, object]:
+    return {
+        label: build_game(label, bet_amount, params, seed) for label in GAME_LABELS if params.get(GAME_FLAGS[label])
+    }
+
+
+def _simulate_chunk(
+    game, num_simulations: int, seed_sequence: np.random.SeedSequence, streaming: bool, chunk_size: int = 100_000
+):
+    # Timed in the worker and returned, since metrics recorded in a child process would be lost.
+    started = time.perf_counter()
+    game.rng = np.random.default_rng(seed_sequence)
+    # Both modes play the share in `chunk_size` chunks, so a seed yields the same rounds in either.
+    if streaming:
+        # Reduced chunk by chunk, so a worker holds at most `chunk_size` rounds however large its share.
+        result = OnlineStatistics()
+        for chunk in iter_simulation_chunks(game, num_simulations, chunk_size):
+            result.update(chunk)
+    else:
+        result = run_simulation_chunked(game, num_simulations, chunk_size)
+    return result, time.perf_counter() - started
+
+
+def _run_parallel(
+    games: Dict[str, object],
+    num_simulations: int,
+    workers: int,
+    seed: int,
+    streaming: bool,
+    progress: Optional[ProgressCallback] = None,
+    chunk_size: int = 100_000,
+) -> Dict[str, list]:
+    """
+    Split every game into `workers` chunks and run all chunks on a process pool.
+    Returns the per-game chunk outputs in round order. Each worker simulates
+    its share `chunk_size` rounds at a time.
+    """
+    # Importing the process pool pulls in multiprocessing, which in-process runs never need.
+    from concurrent.futures import ProcessPoolExecutor
+
+    share = max(1, math.ceil(num_simulations / workers))
+    sizes = [min(share, num_simulations - start) for start in range(0, num_simulations, share)]
+    seeds = game_seed_sequences(seed)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            label: [
+                pool.submit(_simulate_chunk, game, size, chunk_seed, streaming, chunk_size)
+                for size, chunk_seed in zip(sizes, seeds[label].spawn(len(sizes)))
+            ]
+            for label, game in games.items()
+        }
+        if progress:
+            pending = {
+                future: (label, size)
+                for label, chunk_futures in futures.items()
+                for future, size in zip(chunk_futures, sizes)
+            }
+            try:
+                for future in as_completed(pending):
+                    future.result()
+                    progress(*pending[future])
+            except BaseException:
+                # Drop chunks that have not started yet; running ones finish and are discarded.
+                for future in pending:
+                    future.cancel()
+                raise
+        out = {}
+        for label, chunk_futures in futures.items():
+            out[label] = []
+            for future, size in zip(chunk_futures, sizes):
+                chunk, seconds = future.result()
+                METRICS.record_rounds(label, size, seconds)
+                out[label].append(chunk)
+        return out
+
+
+@METRICS.stage("run_games")
+def run_games(
+    num_simulations: int,
+    bet_amount: float,
+    params: dict,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    chunk_size: int = 100_000,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, SimulationResult]:
+    seed = new_seed() if seed is None else seed
+    games = build_games(bet_amount, params, seed)
+    if workers <= 1:
+        # Same chunking as streaming mode, so a seed yields the same rounds in both modes.
+        out = {
+            label: run_simulation_chunked(game, num_simulations, chunk_size, label, progress)
+            for label, game in games.items()
+        }
+    else:
+        chunks = _run_parallel(games, num_simulations, workers, seed, False, progress, chunk_size)
+        # Cumulative columns are derived from the concatenated profits, so they run across chunk boundaries.
+        out = {label: SimulationResult.concatenate(game_chunks) for label, game_chunks in chunks.items()}
+    for result in out.values():
+        result.seed = seed
     return out
 
 
-def calculate_statistics(df: pd.DataFrame) -> Dict[str, float]:
-    stats = {
-        "total_games": len(df),
-        "total_bet": df["player_bet"].sum(),
-        "wins": df["player_won"].sum(),
-        "losses": (df["player_won"] == False).sum(),
-        "win_rate": df["player_won"].mean(),
-        "total_player_profit": df["player_profit"].sum(),
-        "total_house_profit": df["house_profit"].sum(),
-        "avg_player_profit_per_game": df["player_profit"].mean(),
-        "avg_house_profit_per_game": df["house_profit"].mean(),
-        "final_player_balance": df["cumulative_player_profit"].iloc[-1],
-        "final_house_balance": df["cumulative_house_profit"].iloc[-1],
-        "max_player_profit": df["cumulative_player_profit"].max(),
-        "min_player_profit": df["cumulative_player_profit"].min(),
-        "max_house_profit": df["cumulative_house_profit"].max(),
-        "min_house_profit": df["cumulative_house_profit"].min(),
+@METRICS.stage("run_games_streaming")
+def run_games_streaming(
+    num_simulations: int,
+    bet_amount: float,
+    params: dict,
+    chunk_size: int = 100_000,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Dict[str, float]]:
+    seed = new_seed() if seed is None else seed
+    games = build_games(bet_amount, params, seed)
+    if workers <= 1:
+        return {
+            label: run_simulation_streaming(game, num_simulations, chunk_size, label, progress)
+            for label, game in games.items()
+        }
+
+    out: Dict[str, Dict[str, float]] = {}
+    parallel = _run_parallel(games, num_simulations, workers, seed, True, progress, chunk_size)
+    for label, game_chunks in parallel.items():
+        online = OnlineStatistics()
+        for chunk in game_chunks:
+            online.merge(chunk)
+        out[label] = online.as_dict()
+    return out
+
+
+@METRICS.stage("run_games_adaptive")
+def run_games_adaptive(
+    target_half_width: float,
+    bet_amount: float,
+    params: dict,
+    confidence: float = 0.95,
+    max_rounds: int = 10_000_000,
+    seed: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Precision-targeted counterpart of run_games_streaming: every game stops on its
+    own once its house-ROI interval is tight enough. Runs in-process.
+    """
+    seed = new_seed() if seed is None else seed
+    return {
+        label: run_simulation_adaptive(
+            game, target_half_width, confidence, max_rounds, label=label, progress=progress
+        )
+        for label, game in build_games(bet_amount, params, seed).items()
     }
-    stats["std_player_profit"] = df["player_profit"].std()
-    stats["std_house_profit"] = df["house_profit"].std()
-    stats["player_roi"] = (stats["total_player_profit"] / stats["total_bet"]) * 100
-    stats["house_roi"] = (stats["total_house_profit"] / stats["total_bet"]) * 100
-    return stats
 
+
+@METRICS.stage("run_games_bankroll")
+def run_games_bankroll(
+    max_rounds: int,
+    bet_amount: float,
+    params: dict,
+    seed: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    **options,
+) -> Dict[str, BankrollResult]:
+    """
+    Bankroll / ruin run for every selected game; `options` are passed to run_bankroll.
+    """
+    seed = new_seed() if seed is None else seed
+    return {
+        label: run_bankroll(game, max_rounds=max_rounds, label=label, progress=progress, **options)
+        for label, game in build_games(bet_amount, params, seed).items()
+    }
+
+
+@METRICS.stage("calculate_statistics")
+def calculate_statistics(results: Union[SimulationResult, "pd.DataFrame"]) -> Dict[str, float]:
+    """
+    Summary statistics for one game's rounds. Only the per-round columns are
+    read, so a SimulationResult's cumulative series is never built here.
+    """
+    return summary_statistics(
+        np.asarray(results["player_bet"], dtype=float),
+        np.asarray(results["player_profit"], dtype=float),
+        np.asarray(results["player_won"], dtype=bool),
+    )
+
+
+def calculate_statistics_chunked(results: SimulationResult, chunk_size: int = 4_000_000) -> Dict[str, float]:
+    """
+    calculate_statistics in bounded memory, e.g. for a memory-mapped stored run.
+    Longer runs are merged chunk by chunk with OnlineStatistics, so their profit
+    percentiles are NaN.
+    """
+    if len(results) <= chunk_size:
+        return calculate_statistics(results)
+    online = OnlineStatistics()
+    for chunk in results.chunks(chunk_size):
+        online.update(chunk)
+    return online.as_dict()
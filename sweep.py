@@ -0,0 +1,137 @@
+"""
+Parameter sweeps over a game's payout settings with common random numbers.
+"""
+
+import itertools
+import math
+import statistics
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from analysis import exact_statistics
+from games import new_seed
+from simulation import OnlineStatistics, build_game
+from variance import uniform_payout_multipliers
+
+# Sweepable /simulate parameter -> the game it configures.
+SWEEP_PARAMETERS = {
+    "tweaked_payout": "Reduced Payout",
+    "weighted_prob": "Weighted Probabilities",
+    "modified_payout": "Modified Payout",
+    "normal_mean": "Normal Distribution",
+    "normal_std": "Normal Distribution",
+    "lucky9_payout": "Lucky 9",
+}
+
+
+def parse_values(spec) -> List[float]:
+    """
+    Grid values from a list, a {"start", "stop", "steps"} range, or the form
+    strings "1,2,3" and "start:stop:steps".
+    """
+    if isinstance(spec, dict):
+        return np.linspace(float(spec["start"]), float(spec["stop"]), int(spec["steps"])).tolist()
+    if isinstance(spec, str):
+        if ":" in spec:
+            start, stop, steps = spec.split(":")
+            return np.linspace(float(start), float(stop), int(steps)).tolist()
+        return [float(value) for value in spec.split(",") if value.strip()]
+    return [float(value) for value in spec]
+
+
+def sweep_game(grid: Dict[str, Sequence[float]]) -> str:
+    games = {SWEEP_PARAMETERS.get(name) for name in grid}
+    if None in games:
+        unknown = [name for name in grid if name not in SWEEP_PARAMETERS]
+        raise ValueError(f"cannot sweep {', '.join(unknown)}; expected one of {', '.join(SWEEP_PARAMETERS)}")
+    if len(games) != 1:
+        raise ValueError("all swept parameters must belong to the same game")
+    return games.pop()
+
+
+def _point_game(label: str, point: Dict[str, float], bet_amount: float):
+    # Built directly: "modified_payout" is also that game's flag, so a 0x point would deselect it.
+    return build_game(label, bet_amount, point)
+
+
+def _row_moments(values: np.ndarray) -> (np.ndarray, np.ndarray):
+    means = values.mean(axis=1)
+    return means, ((values - means[:, None]) ** 2).sum(axis=1)
+
+
+def run_sweep(
+    grid: Dict[str, Sequence[float]],
+    num_simulations: int = 100_000,
+    bet_amount: float = 1.0,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    chunk_size: int = 100_000,
+) -> Dict:
+    """
+    Simulate every point of the Cartesian grid on the same random draws.
+
+    Each chunk draws its randomness once: the win-event uniform (plus the
+    normal multiplier draw) for the dice games, or one dealt batch of Lucky 9
+    hands. Every grid point then maps those draws to its own payouts, so the
+    differences between points carry very little Monte Carlo noise.
+    """
+    label = sweep_game(grid)
+    names = list(grid)
+    points = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    games = [_point_game(label, point, bet_amount) for point in points]
+    seed = new_seed() if seed is None else seed
+    rng = np.random.default_rng(seed)
+
+    count = 0
+    mean = np.zeros(len(points))
+    m2 = np.zeros(len(points))
+    delta_mean = np.zeros(len(points))
+    delta_m2 = np.zeros(len(points))
+    for start in range(0, num_simulations, chunk_size):
+        size = min(chunk_size, num_simulations - start)
+        if label == "Lucky 9":
+            games[0].rng = rng
+            hands = games[0].play_batch(size)
+            won_multipliers = np.array([game.payout_multiplier for game in games])[:, None]
+            edges = 1 - np.where(hands["tie"], 1.0, np.where(hands["player_won"], won_multipliers, 0.0))
+        else:
+            uniforms = rng.random((size, 1))
+            normals = rng.standard_normal(size) if label == "Normal Distribution" else None
+            edges = np.array([1 - uniform_payout_multipliers(game, uniforms, normals) for game in games])
+
+        # House profit per unit bet, and its paired difference from the first grid point.
+        mean, m2 = OnlineStatistics._merge_moments(count, mean, m2, size, *_row_moments(edges))
+        delta_mean, delta_m2 = OnlineStatistics._merge_moments(
+            count, delta_mean, delta_m2, size, *_row_moments(edges - edges[0])
+        )
+        count += size
+
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    scale = z / math.sqrt(count) * 100
+    variance = m2 / max(count - 1, 1)
+    delta_variance = delta_m2 / max(count - 1, 1)
+    rows = []
+    for index, (point, game) in enumerate(zip(points, games)):
+        rows.append(
+            {
+                "params": point,
+                "house_edge": float(mean[index]) * 100,
+                "house_edge_ci": math.sqrt(variance[index]) * scale,
+                "player_roi": -float(mean[index]) * 100,
+                "exact_house_edge": exact_statistics(game)["house_edge"],
+                "delta_vs_first": float(mean[index] - mean[0]) * 100,
+                "delta_ci": math.sqrt(delta_variance[index]) * scale,
+                # What the difference's interval would be with independent streams per point.
+                "independent_delta_ci": math.sqrt(variance[index] + variance[0]) * scale if index else 0.0,
+            }
+        )
+    return {
+        "game": label,
+        "parameters": names,
+        "grid": {name: list(grid[name]) for name in names},
+        "num_simulations": count,
+        "bet_amount": bet_amount,
+        "confidence": confidence,
+        "seed": seed,
+        "rows": rows,
+    }
@@ -0,0 +1,285 @@
+"""
+In-memory game tables for the interactive games. Each table owns its RNG
+stream, player balances and house ledger, and settles pending bets in
+micro-batches: one vectorized play_batch() call pays every waiting player.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from bulk import BULK_GAMES, bulk_game
+from games import COLORS, new_seed
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+class TableLimit(Exception):
+    pass
+
+
+class _Bet:
+    __slots__ = ("player", "amount", "outcome", "error", "settled", "wake")
+
+    def __init__(self, player: str, amount: float):
+        self.player = player
+        self.amount = amount
+        self.outcome: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+        self.settled = False
+        # Held until the bet is settled or promoted to settle the next batch; a bare
+        # lock is a cheaper one-shot signal than an Event.
+        self.wake = threading.Lock()
+        self.wake.acquire()
+
+
+class GameTable:
+    """
+    One table. Bets are escrowed from the player's balance when placed and
+    queued. A bettor who finds no settlement running settles every queued bet
+    in one draw; bets placed meanwhile wait, and the oldest of them is then
+    woken to settle the next batch. Each thread settles at most one batch, the
+    one holding its own bet. The table lock guards the queue, balances and
+    ledger, never the draw itself.
+    """
+
+    def __init__(self, table_id: str, game: str, params: dict, seed: Optional[int] = None, max_batch: int = 4096):
+        self.id = table_id
+        self.game_name = game
+        self.params = dict(params)
+        self.game = bulk_game(game, params, new_seed() if seed is None else seed)
+        self.seed = self.game.seed
+        self.max_batch = max_batch
+        self.balances: Dict[str, float] = {}
+        self.rounds = 0
+        self.batches = 0
+        self.total_bet = 0.0
+        self.total_payout = 0.0
+        self.last_used = time.monotonic()
+        self._pending: List[_Bet] = []
+        # Bets per player placed but not yet settled, queued or in a batch being drawn.
+        self._open_bets: Dict[str, int] = {}
+        self._settling = False
+        self._lock = threading.Lock()
+        if game == "slot":
+            self._symbols = self.game.model.symbol_list
+
+    def join(self, player: str, buy_in: float) -> float:
+        if buy_in < 0:
+            raise ValueError("buy_in must not be negative")
+        with self._lock:
+            self.balances[player] = self.balances.get(player, 0.0) + buy_in
+            self.last_used = time.monotonic()
+            return self.balances[player]
+
+    def leave(self, player: str) -> float:
+        """
+        Remove the player and return the cash-out. Refused while the player has
+        bets being settled, so every payout reaches a balance and the house
+        profit stays buy-ins minus balances and cash-outs.
+        """
+        with self._lock:
+            if player not in self.balances:
+                raise KeyError(player)
+            if self._open_bets.get(player):
+                raise ValueError("the player has bets still being settled")
+            return self.balances.pop(player)
+
+    def bet(self, player: str, amount: float) -> Dict:
+        """
+        Escrow `amount`, wait for the batch that settles it and return the round's outcome.
+        """
+        if amount <= 0:
+            raise ValueError("bet_amount must be positive")
+        bet = _Bet(player, amount)
+        with self._lock:
+            balance = self.balances.get(player)
+            if balance is None:
+                raise KeyError(player)
+            if balance < amount:
+                raise InsufficientFunds(f"balance {balance:.2f} is below the bet {amount:.2f}")
+            self.balances[player] = balance - amount
+            self._open_bets[player] = self._open_bets.get(player, 0) + 1
+            self._pending.append(bet)
+            self.last_used = time.monotonic()
+            lead = not self._settling
+            self._settling = True
+
+        if not lead:
+            bet.wake.acquire()
+        if not bet.settled:
+            # Either no settlement was running or this bet was promoted; it is the oldest queued bet.
+            self._settle_batch()
+        if bet.error is not None:
+            raise bet.error
+        return bet.outcome
+
+    def _settle_batch(self) -> None:
+        with self._lock:
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+        try:
+            outcomes = self._play(batch)
+        except Exception as exc:
+            with self._lock:
+                for bet in batch:
+                    # Refund the escrow so a failed draw does not cost the player.
+                    self.balances[bet.player] += bet.amount
+                self._close_bets(batch)
+            outcomes = [None] * len(batch)
+            for bet in batch:
+                bet.error = exc
+        for bet, outcome in zip(batch, outcomes):
+            bet.outcome = outcome
+            bet.settled = True
+            bet.wake.release()
+        with self._lock:
+            if self._pending:
+                self._pending[0].wake.release()
+            else:
+                self._settling = False
+
+    def _play(self, batch: List[_Bet]) -> List[Dict]:
+        draw = self.game.play_batch(len(batch))
+        amounts = np.fromiter((bet.amount for bet in batch), dtype=float, count=len(batch))
+        # Table games play a unit bet, so the batch payout is the multiplier.
+        payouts = np.round(amounts * draw["payout"] / self.game.bet_amount, 2)
+        details = self._details(draw)
+
+        outcomes = []
+        with self._lock:
+            self.rounds += len(batch)
+            self.batches += 1
+            self.total_bet += float(amounts.sum())
+            self.total_payout += float(payouts.sum())
+            for bet, payout, detail in zip(batch, payouts.tolist(), details):
+                balance = self.balances[bet.player] + payout
+                self.balances[bet.player] = balance
+                outcomes.append(
+                    {
+                        **detail,
+                        "bet_amount": bet.amount,
+                        "payout": payout,
+                        "player_profit": round(payout - bet.amount, 2),
+                        "house_profit": round(bet.amount - payout, 2),
+                        "balance": balance,
+                    }
+                )
+            self._close_bets(batch)
+        return outcomes
+
+    def _close_bets(self, batch: List[_Bet]) -> None:
+        # Called with the table lock held.
+        for bet in batch:
+            remaining = self._open_bets[bet.player] - 1
+            if remaining:
+                self._open_bets[bet.player] = remaining
+            else:
+                del self._open_bets[bet.player]
+
+    def _details(self, draw: Dict[str, np.ndarray]) -> List[Dict]:
+        if self.game_name == "roll":
+            return [
+                {"dice": [COLORS[code] for code in dice], "matches": matches}
+                for dice, matches in zip(draw["dice_codes"].tolist(), draw["matches"].tolist())
+            ]
+        if self.game_name == "lucky9":
+            return [
+                {
+                    "player_cards": player,
+                    "dealer_cards": dealer,
+                    "player_total": player_total,
+                    "dealer_total": dealer_total,
+                    "tie": tie,
+                }
+                for player, dealer, player_total, dealer_total, tie in zip(
+                    draw["player_cards"].tolist(),
+                    draw["dealer_cards"].tolist(),
+                    draw["player_total"].tolist(),
+                    draw["dealer_total"].tolist(),
+                    draw["tie"].tolist(),
+                )
+            ]
+        return [{"spin": [self._symbols[code] for code in spin]} for spin in draw["spin_codes"].tolist()]
+
+    def as_dict(self, balances: bool = False) -> Dict:
+        with self._lock:
+            state = {
+                "table_id": self.id,
+                "game": self.game_name,
+                "params": self.params,
+                "seed": self.seed,
+                "players": len(self.balances),
+                "pending_bets": len(self._pending),
+                "ledger": {
+                    "rounds": self.rounds,
+                    "batches": self.batches,
+                    "mean_batch_size": self.rounds / self.batches if self.batches else 0.0,
+                    "total_bet": round(self.total_bet, 2),
+                    "total_payout": round(self.total_payout, 2),
+                    "house_profit": round(self.total_bet - self.total_payout, 2),
+                    "house_roi": (self.total_bet - self.total_payout) / self.total_bet * 100 if self.total_bet else 0.0,
+                },
+            }
+            if balances:
+                state["balances"] = {player: round(balance, 2) for player, balance in self.balances.items()}
+            return state
+
+
+class TableEngine:
+    """
+    Registry of open tables. Idle tables expire after `ttl` seconds; opening a
+    table beyond `max_tables` raises TableLimit.
+    """
+
+    def __init__(self, max_tables: int = 1000, ttl: float = 3600.0, max_batch: int = 4096):
+        self.max_tables = max_tables
+        self.ttl = ttl
+        self.max_batch = max_batch
+        self._tables: "OrderedDict[str, GameTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        for table_id in [
+            table_id for table_id, table in self._tables.items() if table.last_used + self.ttl <= now
+        ]:
+            del self._tables[table_id]
+
+    def open(self, game: str, params: dict, seed: Optional[int] = None) -> GameTable:
+        if game not in BULK_GAMES:
+            raise ValueError(f"unknown game {game!r}; expected one of {', '.join(BULK_GAMES)}")
+        table = GameTable(secrets.token_urlsafe(8), game, params, seed, self.max_batch)
+        with self._lock:
+            self._expire(time.monotonic())
+            if len(self._tables) >= self.max_tables:
+                raise TableLimit(f"at most {self.max_tables} tables may be open")
+            self._tables[table.id] = table
+        return table
+
+    def get(self, table_id: str) -> Optional[GameTable]:
+        # Only the requested table is checked, so a lookup stays O(1) however many tables are open.
+        with self._lock:
+            table = self._tables.get(table_id)
+            if table is not None and table.last_used + self.ttl <= time.monotonic():
+                del self._tables[table_id]
+                return None
+            return table
+
+    def close(self, table_id: str) -> Optional[GameTable]:
+        with self._lock:
+            return self._tables.pop(table_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tables)
+
+    def tables(self) -> List[GameTable]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return list(self._tables.values())
@@ -0,0 +1,157 @@
+"""
+Variance-reduced house-edge estimators: antithetic variates, control variates
+on the known win probability, and stratified sampling of the driving uniforms.
+"""
+
+import math
+import numpy as np
+from typing import Dict
+
+from analysis import win_probability
+from games import DiceGame, NormalDistributionGame, SlotMachineGame
+
+METHODS = ("plain", "antithetic", "control_variate", "stratified")
+# Largest value below 1.0, so 1 - u stays inside [0, 1) for the alias table lookups.
+_BELOW_ONE = np.nextafter(1.0, 0.0)
+
+
+def uniform_payout_multipliers(game, uniforms: np.ndarray, normals: np.ndarray = None) -> np.ndarray:
+    """
+    Payout / bet for rounds driven by the given uniforms.
+    Dice games use one column (the win event), the normal-distribution game one
+    column plus a standard normal for its multiplier, and the slot five columns
+    laid out as in SlotMachineModel.spin().
+    """
+    if isinstance(game, SlotMachineGame):
+        return game.model.payout_multipliers(game.model.spin_from_uniforms(uniforms))
+    won = uniforms[:, 0] < win_probability(game)
+    if isinstance(game, NormalDistributionGame):
+        multiplier = game.mean_multiplier + game.std_multiplier * normals
+        multiplier = np.clip(multiplier, game.min_multiplier, game.max_multiplier)
+        return np.where(won, np.maximum(0.0, multiplier), 0.0)
+    if isinstance(game, DiceGame):
+        return game._calculate_payouts(won) / game.bet_amount
+    raise ValueError(f"no uniform-driven sampler for {type(game).__name__}; use plain or control_variate")
+
+
+def _uniform_columns(game) -> int:
+    return 5 if isinstance(game, SlotMachineGame) else 1
+
+
+def _result(method: str, rounds: int, mean_multiplier: float, variance: float, plain_variance: float) -> Dict:
+    """
+    Package an estimate. `variance` is the estimator's per-round variance, so
+    rounds * plain_variance / variance is the plain Monte Carlo sample size with
+    the same precision. A variance at rounding-error level counts as exact.
+    """
+    variance = max(float(variance), 0.0)
+    if variance <= plain_variance * 1e-12:
+        variance = 0.0
+    factor = plain_variance / variance if variance > 0 else math.inf
+    return {
+        "method": method,
+        "rounds": rounds,
+        "house_edge": (1 - mean_multiplier) * 100,
+        "std_error": math.sqrt(variance / rounds) * 100,
+        "plain_std_error": math.sqrt(plain_variance / rounds) * 100,
+        "variance_reduction": factor,
+        "effective_sample_size": rounds * factor,
+    }
+
+
+def plain_estimate(game, rounds: int) -> Dict:
+    multipliers = game.play_batch(rounds)["payout"] / game.bet_amount
+    variance = multipliers.var(ddof=1)
+    return _result("plain", rounds, multipliers.mean(), variance, variance)
+
+
+def antithetic_estimate(game, rounds: int) -> Dict:
+    """
+    Pair each round's uniforms u with 1 - u (and the normal draw z with -z);
+    the estimate is the mean of the pair averages.
+    """
+    pairs = max(rounds // 2, 2)
+    uniforms = game.rng.random((pairs, _uniform_columns(game)))
+    normals = game.rng.standard_normal(pairs) if isinstance(game, NormalDistributionGame) else None
+    first = uniform_payout_multipliers(game, uniforms, normals)
+    mirrored = np.minimum(1 - uniforms, _BELOW_ONE)
+    second = uniform_payout_multipliers(game, mirrored, None if normals is None else -normals)
+    pair_means = (first + second) / 2
+    plain_variance = np.concatenate([first, second]).var(ddof=1)
+    # Each pair costs two rounds, so its variance is spread over both.
+    return _result("antithetic", 2 * pairs, pair_means.mean(), 2 * pair_means.var(ddof=1), plain_variance)
+
+
+def control_variate_estimate(game, rounds: int) -> Dict:
+    """
+    Regress the payout on the player_won indicator, whose mean is known exactly,
+    and subtract the fitted deviation of the sample win rate.
+    """
+    batch = game.play_batch(rounds)
+    return control_variate_from_rounds(game, batch["payout"], batch["player_won"])
+
+
+def control_variate_from_rounds(game, payout: np.ndarray, player_won: np.ndarray) -> Dict:
+    """
+    Control-variate estimate from rounds that were already played, e.g. a SimulationResult's columns.
+    Built from running sums over the columns, so no round-sized temporaries are allocated.
+    Needs at least two rounds.
+    """
+    n = len(payout)
+    if n < 2:
+        raise ValueError("a control-variate estimate needs at least two rounds")
+    payout = np.asarray(payout, dtype=float)
+    player_won = np.asarray(player_won, dtype=bool)
+    wins = np.count_nonzero(player_won)
+    # Sums of the payout multiplier m and the win indicator w (w * w == w).
+    sum_m = payout.sum() / game.bet_amount
+    sum_mm = np.dot(payout, payout) / game.bet_amount**2
+    sum_mw = payout.sum(where=player_won) / game.bet_amount
+    mean_m = sum_m / n
+    mean_w = wins / n
+    var_m = (sum_mm - n * mean_m**2) / (n - 1)
+    var_w = (wins - n * mean_w**2) / (n - 1)
+    cov_mw = (sum_mw - n * mean_m * mean_w) / (n - 1)
+    slope = cov_mw / var_w if var_w > 0 else 0.0
+    # m - slope * (w - p): same slope for every round, so its moments follow from the sums above.
+    adjusted_mean = mean_m - slope * (mean_w - win_probability(game))
+    adjusted_variance = var_m - 2 * slope * cov_mw + slope**2 * var_w
+    return _result("control_variate", n, adjusted_mean, adjusted_variance, var_m)
+
+
+def stratified_estimate(game, rounds: int, replicates: int = 10) -> Dict:
+    """
+    Split [0, 1) into equal strata and put one round in each for the win-event
+    column (and, for the slot, the first reel); other columns stay independent.
+    The variance comes from `replicates` independent stratified batches.
+    """
+    per_replicate = max(rounds // replicates, 2)
+    columns = _uniform_columns(game)
+    means = []
+    plain = []
+    for _ in range(replicates):
+        uniforms = game.rng.random((per_replicate, columns))
+        stratified = [0, 2] if columns == 5 else [0]
+        for column in stratified:
+            uniforms[:, column] = (game.rng.permutation(per_replicate) + uniforms[:, column]) / per_replicate
+        normals = game.rng.standard_normal(per_replicate) if isinstance(game, NormalDistributionGame) else None
+        multipliers = uniform_payout_multipliers(game, uniforms, normals)
+        means.append(multipliers.mean())
+        plain.append(multipliers)
+    means = np.array(means)
+    total = per_replicate * replicates
+    plain_variance = np.concatenate(plain).var(ddof=1)
+    # Variance of the replicate mean, rescaled to a per-round variance.
+    return _result("stratified", total, means.mean(), means.var(ddof=1) * per_replicate, plain_variance)
+
+
+def estimate_house_edge(game, rounds: int, method: str = "control_variate") -> Dict:
+    estimators = {
+        "plain": plain_estimate,
+        "antithetic": antithetic_estimate,
+        "control_variate": control_variate_estimate,
+        "stratified": stratified_estimate,
+    }
+    if method not in estimators:
+        raise ValueError(f"unknown method {method!r}; expected one of {', '.join(METHODS)}")
+    return estimators[method](game, rounds)